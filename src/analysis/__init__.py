@@ -1,12 +1,24 @@
 # Analysis modules
-from .stock_levels import StockLevelAnalyzer
-from .forecasting import DemandForecaster
-from .abc_xyz import ABCXYZAnalyzer
-from .turnover import TurnoverAnalyzer
-
-__all__ = [
-    "StockLevelAnalyzer",
-    "DemandForecaster",
-    "ABCXYZAnalyzer",
-    "TurnoverAnalyzer",
-]
+#
+# Imported lazily (PEP 562): each analyzer pulls in pandas/NumPy/SciPy, so the
+# server can start, and answer tools that need none of them, without paying
+# for those imports up front.
+import importlib
+
+_ANALYZERS = {
+    "StockLevelAnalyzer": ".stock_levels",
+    "DemandForecaster": ".forecasting",
+    "ABCXYZAnalyzer": ".abc_xyz",
+    "TurnoverAnalyzer": ".turnover",
+}
+
+__all__ = list(_ANALYZERS)
+
+
+def __getattr__(name):
+    module = _ANALYZERS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -35,7 +35,7 @@ class XYZClass(str, Enum):
     Z = "Z"
 
 
-@dataclass
+@dataclass(slots=True)
 class ABCXYZResult:
     """Result of ABC/XYZ analysis for a product."""
     product_id: int
@@ -114,70 +114,79 @@ class ABCXYZAnalyzer:
 
         # Get consumption data for all products
         product_id_list = [p["id"] for p in products]
-        consumption_data = self._get_consumption_data(
+        consumption = self._get_consumption_data(
             product_id_list,
             analysis_period_days,
             location_id
         )
+        has_moves = np.isin(product_id_list, consumption.index.to_numpy())
+        consumption = consumption.reindex(product_id_list, fill_value=0)
 
-        # Calculate metrics for each product
+        # Calculate metrics column-wise for all products at once
         # Note: Using quantity-based ABC since we don't have access to standard_price
-        product_metrics = []
-        for product in products:
-            pid = product["id"]
-            cons = consumption_data.get(pid, {})
-
-            annual_qty = cons.get("total_quantity", 0)
-            # Use quantity as proxy for value since price not available
-            annual_value = annual_qty
-
-            monthly_demands = cons.get("monthly_demands", [])
-            if monthly_demands:
-                avg_demand = np.mean(monthly_demands)
-                std_demand = np.std(monthly_demands)
-                cv = std_demand / avg_demand if avg_demand > 0 else 0
-            else:
-                avg_demand = 0
-                std_demand = 0
-                cv = 0
-
-            product_metrics.append({
-                "product": product,
-                "annual_value": annual_value,  # Actually quantity-based
-                "annual_quantity": annual_qty,
-                "unit_cost": 0,  # Not available
-                "avg_monthly_demand": avg_demand,
-                "demand_std": std_demand,
-                "demand_cv": cv
-            })
+        annual_qty = consumption["total_quantity"].to_numpy(dtype=float)
+        whole_qty = consumption["whole_quantity"].to_numpy(dtype=bool)
+        avg_demand = consumption["avg_monthly_demand"].to_numpy(dtype=float)
+        std_demand = consumption["demand_std"].to_numpy(dtype=float)
+        cv = np.divide(
+            std_demand, avg_demand,
+            out=np.zeros_like(std_demand), where=avg_demand > 0
+        )
 
         # Sort by annual quantity (descending) for ABC classification
-        product_metrics.sort(key=lambda x: x["annual_quantity"], reverse=True)
+        order = np.argsort(-annual_qty, kind="stable")
+        annual_qty = annual_qty[order]
+        # Use quantity as proxy for value since price not available
+        annual_value = annual_qty
 
         # Calculate total value and cumulative percentages
-        total_value = sum(p["annual_value"] for p in product_metrics)
+        total_value = annual_value.sum()
         if total_value == 0:
             total_value = 1  # Avoid division by zero
+        value_pct = annual_value / total_value
+        cumulative = np.cumsum(value_pct)
+
+        # ABC / XYZ classification
+        abc_classes = np.select(
+            [cumulative <= abc_thresh["A"], cumulative <= abc_thresh["B"]],
+            [ABCClass.A.value, ABCClass.B.value],
+            ABCClass.C.value
+        )
+        cv = cv[order]
+        xyz_classes = np.select(
+            [cv < xyz_thresh["X"], cv < xyz_thresh["Y"]],
+            [XYZClass.X.value, XYZClass.Y.value],
+            XYZClass.Z.value
+        )
 
-        cumulative = 0
-        results = []
-
-        for pm in product_metrics:
-            product = pm["product"]
-            value_pct = pm["annual_value"] / total_value
-            cumulative += value_pct
-
-            # ABC Classification
-            abc_class = self._classify_abc(cumulative, abc_thresh)
-
-            # XYZ Classification
-            xyz_class = self._classify_xyz(pm["demand_cv"], xyz_thresh)
-
-            # Combined class
-            combined = f"{abc_class.value}{xyz_class.value}"
+        # Materialize result rows only at the end
+        columns = zip(
+            order.tolist(),
+            whole_qty[order].tolist(),
+            abc_classes.tolist(),
+            xyz_classes.tolist(),
+            annual_value.tolist(),
+            value_pct.tolist(),
+            cumulative.tolist(),
+            cv.tolist(),
+            avg_demand[order].tolist(),
+            std_demand[order].tolist()
+        )
 
-            # Generate recommendation
-            recommendation = self._generate_recommendation(abc_class, xyz_class)
+        results = []
+        for idx, whole, abc, xyz, value, pct, cum, demand_cv, avg, std in columns:
+            product = products[idx]
+            abc_class = ABCClass(abc)
+            xyz_class = XYZClass(xyz)
+            # Metrics without data stay integer zeros, as in the per-product
+            # version: no moves means no demand, no mean demand means no CV
+            if not has_moves[idx]:
+                value = avg = std = 0
+            elif whole:
+                # Odoo sent whole-number quantities; their sum stays an int
+                value = int(value)
+            if not avg > 0:
+                demand_cv = 0
 
             results.append(ABCXYZResult(
                 product_id=product["id"],
@@ -186,16 +195,16 @@ class ABCXYZAnalyzer:
                 category=product["categ_id"][1] if product.get("categ_id") else "Uncategorized",
                 abc_class=abc_class,
                 xyz_class=xyz_class,
-                combined_class=combined,
-                annual_value=round(pm["annual_value"], 2),
-                annual_quantity=round(pm["annual_quantity"], 2),
-                unit_cost=round(pm["unit_cost"], 2),
-                value_percentage=round(value_pct * 100, 2),
-                cumulative_percentage=round(cumulative * 100, 2),
-                demand_cv=round(pm["demand_cv"], 3),
-                avg_monthly_demand=round(pm["avg_monthly_demand"], 2),
-                demand_std=round(pm["demand_std"], 2),
-                recommendation=recommendation
+                combined_class=f"{abc}{xyz}",
+                annual_value=round(value, 2),
+                annual_quantity=round(value, 2),
+                unit_cost=0,  # Not available
+                value_percentage=round(pct * 100, 2),
+                cumulative_percentage=round(cum * 100, 2),
+                demand_cv=round(demand_cv, 3),
+                avg_monthly_demand=round(avg, 2),
+                demand_std=round(std, 2),
+                recommendation=self._generate_recommendation(abc_class, xyz_class)
             ))
 
         return results
@@ -205,8 +214,14 @@ class ABCXYZAnalyzer:
         product_ids: list[int],
         days: int,
         location_id: int
-    ) -> dict[int, dict]:
-        """Get consumption data for products over specified period."""
+    ) -> pd.DataFrame:
+        """
+        Get consumption data for products over specified period.
+
+        Returns a DataFrame indexed by product ID with total_quantity,
+        avg_monthly_demand and demand_std columns, plus whole_quantity,
+        True when every move quantity of the product was an int.
+        """
         date_from = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
         # Get outgoing stock moves from specific location
@@ -223,54 +238,28 @@ class ABCXYZAnalyzer:
             order="date asc"
         )
 
-        # Aggregate by product
-        consumption = {}
-        for move in moves:
-            pid = move["product_id"][0]
-            qty = move.get("product_uom_qty", 0)
-
-            if pid not in consumption:
-                consumption[pid] = {
-                    "total_quantity": 0,
-                    "moves": []
-                }
+        columns = ["total_quantity", "avg_monthly_demand", "demand_std", "whole_quantity"]
+        if not moves:
+            return pd.DataFrame(columns=columns, dtype=float)
 
-            consumption[pid]["total_quantity"] += qty
-            consumption[pid]["moves"].append({
-                "date": move["date"],
-                "quantity": qty
-            })
+        quantities = [m.get("product_uom_qty", 0) for m in moves]
+        df = pd.DataFrame({
+            "product_id": [m["product_id"][0] for m in moves],
+            "quantity": quantities,
+            "whole": [isinstance(q, int) for q in quantities],
+            "month": pd.to_datetime([m["date"] for m in moves]).to_period("M"),
+        })
 
         # Calculate monthly demands for XYZ analysis
-        for pid, data in consumption.items():
-            if data["moves"]:
-                df = pd.DataFrame(data["moves"])
-                df["date"] = pd.to_datetime(df["date"])
-                df["month"] = df["date"].dt.to_period("M")
-                monthly = df.groupby("month")["quantity"].sum().tolist()
-                data["monthly_demands"] = monthly
-            else:
-                data["monthly_demands"] = []
-
-        return consumption
-
-    def _classify_abc(self, cumulative_pct: float, thresholds: dict) -> ABCClass:
-        """Classify product into ABC category."""
-        if cumulative_pct <= thresholds["A"]:
-            return ABCClass.A
-        elif cumulative_pct <= thresholds["B"]:
-            return ABCClass.B
-        else:
-            return ABCClass.C
-
-    def _classify_xyz(self, cv: float, thresholds: dict) -> XYZClass:
-        """Classify product into XYZ category based on demand variability."""
-        if cv < thresholds["X"]:
-            return XYZClass.X
-        elif cv < thresholds["Y"]:
-            return XYZClass.Y
-        else:
-            return XYZClass.Z
+        monthly = df.groupby(["product_id", "month"])["quantity"].sum().groupby(level=0)
+
+        totals = df.groupby("product_id")
+        return pd.DataFrame({
+            "total_quantity": totals["quantity"].sum(),
+            "avg_monthly_demand": monthly.mean(),
+            "demand_std": monthly.std(ddof=0),
+            "whole_quantity": totals["whole"].all(),
+        })[columns]
 
     def _generate_recommendation(
         self,
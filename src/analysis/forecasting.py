@@ -2,16 +2,45 @@
 Demand Forecasting using Time Series Analysis.
 """
 
+import os
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from typing import Optional, Literal
 from datetime import datetime, timedelta
 from enum import Enum
+from operator import itemgetter
 
 import pandas as pd
 import numpy as np
 from scipy import stats
+from scipy.signal import lfilter
 
+from ..cache import TTLCache
 from ..odoo_client import OdooClient
+from ..workers import get_process_pool_size
+
+
+_QUANTITY = itemgetter("quantity")
+
+# Per-product demand history, shared by forecast calls that differ only in
+# method or horizon (e.g. forecast_demand then get_forecast_summary), bounded
+# by total periods under the same row limit as the client read cache
+_HISTORY_CACHE = TTLCache(
+    maxsize=4096,
+    ttl=float(os.environ.get("ANALYSIS_CACHE_TTL", "60")),
+    maxweight=int(os.environ.get("ODOO_READ_CACHE_ROWS", "20000"))
+)
+
+
+def _exponential_smoothing(data: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Simple exponential smoothing, s[0] = x[0], s[t] = alpha*x[t] + (1-alpha)*s[t-1].
+
+    Runs the recurrence as a first-order IIR filter in C instead of a Python loop.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], data, zi=[(1.0 - alpha) * data[0]])
+    return smoothed
 
 
 class ForecastMethod(str, Enum):
@@ -23,7 +52,7 @@ class ForecastMethod(str, Enum):
     AUTO = "auto"  # Automatically select best method
 
 
-@dataclass
+@dataclass(slots=True)
 class ForecastResult:
     """Result of demand forecasting for a product."""
     product_id: int
@@ -43,6 +72,8 @@ class DemandForecaster:
 
     # Default WH/Stock location ID
     DEFAULT_LOCATION_ID = 8  # WH/Stock
+    # Minimum number of products before fanning out to a process pool
+    PARALLEL_MIN_PRODUCTS = 20
 
     def __init__(self, odoo_client: OdooClient):
         self.client = odoo_client
@@ -55,7 +86,8 @@ class DemandForecaster:
         method: ForecastMethod = ForecastMethod.AUTO,
         historical_days: int = 365,
         confidence_level: float = 0.95,
-        location_id: Optional[int] = None
+        location_id: Optional[int] = None,
+        executor: Optional[Executor] = None
     ) -> list[ForecastResult]:
         """
         Forecast demand for products.
@@ -68,6 +100,8 @@ class DemandForecaster:
             historical_days: Days of historical data to use
             confidence_level: Confidence level for prediction intervals
             location_id: Filter by location (default: WH/Stock)
+            executor: Optional process pool used to fit models in parallel
+                once the history has been fetched
 
         Returns:
             List of ForecastResult objects
@@ -89,45 +123,45 @@ class DemandForecaster:
                 limit=100  # Limit for performance
             )
 
-        results = []
+        # Fetch history in this process, the model fitting is pure CPU work
+        items = []
         for product in products:
             try:
-                result = self._forecast_product(
-                    product,
-                    periods,
-                    period_type,
-                    method,
+                history = self._get_demand_history(
+                    product["id"],
                     historical_days,
-                    confidence_level,
+                    period_type,
                     location_id
                 )
-                if result:
-                    results.append(result)
-            except Exception as e:
-                # Skip products with insufficient data
+            except Exception:
                 continue
+            if len(history) >= 4:  # Need minimum data points
+                items.append((product, history))
+
+        params = (periods, period_type, method, confidence_level)
+        if executor is None or len(items) < self.PARALLEL_MIN_PRODUCTS:
+            return _forecast_chunk(items, params)
+
+        # One chunk per worker the pool actually has (MCP_PROCESS_WORKERS)
+        workers = get_process_pool_size() or os.cpu_count() or 1
+        size = -(-len(items) // workers)
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
 
+        results = []
+        for chunk_results in executor.map(_forecast_chunk, chunks, [params] * len(chunks)):
+            results.extend(chunk_results)
         return results
 
     def _forecast_product(
         self,
         product: dict,
+        history: list[dict],
         periods: int,
         period_type: str,
         method: ForecastMethod,
-        historical_days: int,
-        confidence_level: float,
-        location_id: int
+        confidence_level: float
     ) -> Optional[ForecastResult]:
-        """Forecast demand for a single product."""
-        # Get historical demand data
-        history = self._get_demand_history(
-            product["id"],
-            historical_days,
-            period_type,
-            location_id
-        )
-
+        """Forecast demand for a single product from its demand history."""
         if len(history) < 4:  # Need minimum data points
             return None
 
@@ -189,9 +223,23 @@ class DemandForecaster:
         period_type: str,
         location_id: int
     ) -> list[dict]:
-        """Get historical demand data aggregated by period."""
+        """Get historical demand data aggregated by period, reusing recent results."""
         date_from = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-
+        key = (product_id, date_from, period_type, location_id)
+        history = _HISTORY_CACHE.get(key)
+        if history is None:
+            history = self._load_demand_history(product_id, date_from, period_type, location_id)
+            _HISTORY_CACHE.set(key, history, weight=len(history))
+        return history
+
+    def _load_demand_history(
+        self,
+        product_id: int,
+        date_from: str,
+        period_type: str,
+        location_id: int
+    ) -> list[dict]:
+        """Fetch and aggregate demand history since date_from."""
         # Get outgoing moves (sales) from specific location
         moves = self.client.search_read(
             "stock.move",
@@ -361,13 +409,10 @@ class DemandForecaster:
         """Exponential smoothing forecast."""
         alpha = 0.3  # Smoothing parameter
 
-        # Calculate exponential smoothing
-        smoothed = [data[0]]
-        for i in range(1, len(data)):
-            smoothed.append(alpha * data[i] + (1 - alpha) * smoothed[-1])
+        smoothed = _exponential_smoothing(data, alpha)
 
         forecast_value = smoothed[-1]
-        residuals = data - np.array(smoothed[:len(data)])
+        residuals = data - smoothed
         std_error = np.std(residuals)
         z_score = stats.norm.ppf((1 + confidence_level) / 2)
 
@@ -480,11 +525,7 @@ class DemandForecaster:
             predictions = np.full(holdout, forecast)
         else:
             # Simple exponential smoothing for validation
-            alpha = 0.3
-            smoothed = train[0]
-            for val in train[1:]:
-                smoothed = alpha * val + (1 - alpha) * smoothed
-            predictions = np.full(holdout, smoothed)
+            predictions = np.full(holdout, _exponential_smoothing(train, 0.3)[-1])
 
         errors = test - predictions
         return {
@@ -502,7 +543,7 @@ class DemandForecaster:
             return {}
 
         total_forecast = sum(
-            sum(p["quantity"] for p in f.forecast_periods)
+            sum(map(_QUANTITY, f.forecast_periods))
             for f in forecasts
         )
 
@@ -523,3 +564,35 @@ class DemandForecaster:
             "seasonality_detected_count": sum(1 for f in forecasts if f.seasonality_detected),
             "accuracy_metrics": avg_accuracy
         }
+
+
+def _forecast_chunk(
+    items: list[tuple[dict, list[dict]]],
+    params: tuple
+) -> list[ForecastResult]:
+    """
+    Fit forecasts for a batch of (product, history) pairs.
+
+    Module-level so it can be pickled and run in a worker process.
+    """
+    periods, period_type, method, confidence_level = params
+    forecaster = DemandForecaster(None)
+
+    results = []
+    for product, history in items:
+        try:
+            result = forecaster._forecast_product(
+                product,
+                history,
+                periods,
+                period_type,
+                method,
+                confidence_level
+            )
+            if result:
+                results.append(result)
+        except Exception:
+            # Skip products with insufficient data
+            continue
+
+    return results
@@ -4,6 +4,7 @@ Stock Levels and Reorder Points Analysis.
 
 from dataclasses import dataclass
 from typing import Optional
+from datetime import datetime, timedelta
 from enum import Enum
 
 import pandas as pd
@@ -21,7 +22,7 @@ class StockStatus(str, Enum):
     OVERSTOCK = "overstock"
 
 
-@dataclass
+@dataclass(slots=True)
 class StockLevelResult:
     """Result of stock level analysis for a product."""
     product_id: int
@@ -84,8 +85,9 @@ class StockLevelAnalyzer:
             ["product_id", "quantity", "reserved_quantity"]
         )
 
-        # Get unique product IDs from quants
-        quant_product_ids = list(set(q["product_id"][0] for q in quants))
+        # Unique product IDs from quants, in ascending order so the domain
+        # (and the read cache key) does not depend on set iteration order
+        quant_product_ids = sorted({q["product_id"][0] for q in quants})
 
         if not quant_product_ids and not include_zero_stock:
             return []
@@ -317,8 +319,6 @@ class StockLevelAnalyzer:
         location_id: Optional[int] = None
     ) -> dict[int, float]:
         """Calculate average daily consumption rate for products."""
-        from datetime import datetime, timedelta
-
         date_from = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
         location_id = location_id or self.DEFAULT_LOCATION_ID
 
@@ -11,6 +11,8 @@ from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import partial
+from operator import attrgetter
 
 import pandas as pd
 import numpy as np
@@ -36,7 +38,7 @@ class AgingBucket(str, Enum):
     OVER_YEAR = "Over 1 year"
 
 
-@dataclass
+@dataclass(slots=True)
 class TurnoverResult:
     """Turnover analysis result for a product."""
     product_id: int
@@ -54,7 +56,7 @@ class TurnoverResult:
     days_since_movement: Optional[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class AgingResult:
     """Aging analysis result for a product."""
     product_id: int
@@ -124,30 +126,33 @@ class TurnoverAnalyzer:
 
         product_id_list = [p["id"] for p in products]
 
-        # Get stock quantities from location
-        quants = self.client.search_read(
-            "stock.quant",
-            [("location_id", "=", location_id), ("quantity", "!=", 0)],
-            ["product_id", "quantity"]
+        # Quants, sales, average inventory and last movements are independent
+        # lookups, so issue them concurrently
+        quants, cogs_data, avg_inventory, last_movements = self.client.gather(
+            # Stock quantities at the location
+            partial(
+                self.client.search_read,
+                "stock.quant",
+                [("location_id", "=", location_id), ("quantity", "!=", 0)],
+                ["product_id", "quantity"]
+            ),
+            # COGS data (outgoing moves valued at cost)
+            partial(self._calculate_cogs, product_id_list, analysis_period_days, location_id),
+            # Average inventory values
+            partial(
+                self._calculate_average_inventory,
+                product_id_list,
+                analysis_period_days,
+                location_id
+            ),
+            # Last movement dates
+            partial(self._get_last_movement_dates, product_id_list, location_id)
         )
         quant_lookup = {}
         for q in quants:
             pid = q["product_id"][0]
             quant_lookup[pid] = quant_lookup.get(pid, 0) + q.get("quantity", 0)
 
-        # Get COGS data (outgoing moves valued at cost)
-        cogs_data = self._calculate_cogs(product_id_list, analysis_period_days, location_id)
-
-        # Get average inventory values
-        avg_inventory = self._calculate_average_inventory(
-            product_id_list,
-            analysis_period_days,
-            location_id
-        )
-
-        # Get last movement dates
-        last_movements = self._get_last_movement_dates(product_id_list, location_id)
-
         results = []
         today = datetime.now().date()
 
@@ -199,7 +204,7 @@ class TurnoverAnalyzer:
             ))
 
         # Sort by turnover ratio (ascending - slowest first for attention)
-        results.sort(key=lambda x: x.turnover_ratio)
+        results.sort(key=attrgetter("turnover_ratio"))
 
         return results
 
@@ -307,7 +312,7 @@ class TurnoverAnalyzer:
             ))
 
         # Sort by average age (oldest first)
-        results.sort(key=lambda x: x.average_age_days, reverse=True)
+        results.sort(key=attrgetter("average_age_days"), reverse=True)
 
         return results
 
@@ -0,0 +1,95 @@
+"""
+Small thread-safe TTL cache.
+
+Used to memoize Odoo lookups that are effectively static for the lifetime of
+a few minutes (category names, tool results). Entries expire after `ttl`
+seconds and the least recently used entries are evicted once `maxsize`
+entries, or `maxweight` total weight (e.g. rows), is exceeded.
+Inside bypass_caches() every cache misses, so a call reads fresh data (and
+stores it for later calls).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Hashable, Iterator, Optional
+
+
+_MISSING = object()
+
+# True while the current call must not be answered from any cache
+_BYPASS: ContextVar[bool] = ContextVar("cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_caches(enabled: bool = True) -> Iterator[None]:
+    """Make every TTLCache miss for the current context (threads started via
+    asyncio.to_thread or OdooClient.gather inherit it)."""
+    token = _BYPASS.set(enabled)
+    try:
+        yield
+    finally:
+        _BYPASS.reset(token)
+
+
+class TTLCache:
+    """LRU cache whose entries expire after a fixed number of seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300, maxweight: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxweight = maxweight
+        # key -> (expiry, weight, value)
+        self._data: OrderedDict[Hashable, tuple[float, float, Any]] = OrderedDict()
+        self._weight = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing, expired or bypassed."""
+        if _BYPASS.get():
+            return default
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires, weight, value = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                self._weight -= weight
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, weight: float = 1) -> None:
+        """
+        Store value under key, evicting the oldest entries if full.
+
+        Values heavier than maxweight on their own are not stored (and drop
+        any older value under key).
+        """
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._weight -= old[1]
+            if self.maxweight is not None and weight > self.maxweight:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, weight, value)
+            self._weight += weight
+            while len(self._data) > self.maxsize or (
+                self.maxweight is not None and self._weight > self.maxweight
+            ):
+                _, (_, evicted, _) = self._data.popitem(last=False)
+                self._weight -= evicted
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+            self._weight = 0.0
+
+    def __len__(self) -> int:
+        return len(self._data)
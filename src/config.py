@@ -3,15 +3,20 @@ Configuration and constants for the MCP server.
 """
 
 import os
-from .odoo_client import OdooClient, OdooConfig
+from .odoo_client import OdooClient, OdooConfig, OdooConnectionError
 
 
 # Default WH/Stock location ID
 DEFAULT_LOCATION_ID = 8
 
 
-def get_odoo_client() -> OdooClient:
-    """Create and connect Odoo client from environment variables."""
+def get_odoo_client(wait: bool = True) -> OdooClient:
+    """
+    Create and connect Odoo client from environment variables.
+
+    With wait=False authentication runs in the background (see
+    OdooClient.connect_async) and failures surface on the first RPC.
+    """
     config = OdooConfig(
         url=os.environ.get("ODOO_URL", "https://duracubeonline.com.au").rstrip("/"),
         database=os.environ.get("ODOO_DB", "live"),
@@ -19,5 +24,8 @@ def get_odoo_client() -> OdooClient:
         api_key=os.environ.get("ODOO_API_KEY", ""),
     )
     client = OdooClient(config)
-    client.connect()
+    if not wait:
+        client.connect_async()
+    elif not client.connect():
+        raise OdooConnectionError("Odoo authentication failed")
     return client
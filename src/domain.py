@@ -0,0 +1,102 @@
+"""
+Small builder for Odoo search domains.
+
+Odoo domains are prefix-notation lists where top-level terms are implicitly
+ANDed and '|' / '&' apply to the next two expressions. Building them by hand
+with appends and inserted '|' sentinels is easy to get wrong, so handlers
+compose Domain objects instead:
+
+    domain = STORABLE_PRODUCT & (D.ilike('name', s) | D.ilike('default_code', s))
+    client.search_read('product.product', list(domain), ...)
+
+A Domain keeps its top-level AND-ed expressions separately, so '&' never
+needs an explicit operator and the flattened list has the same shape a
+hand-written domain would.
+"""
+
+from typing import Any, Iterator
+
+from .config import DEFAULT_LOCATION_ID
+
+
+class Domain:
+    """An Odoo domain; combine with & and |, flatten with list()."""
+
+    __slots__ = ("_exprs",)
+
+    def __init__(self, *exprs: tuple):
+        # Each expression is a complete prefix-notation tuple of domain items
+        self._exprs = exprs
+
+    def __and__(self, other: "Domain") -> "Domain":
+        return Domain(*self._exprs, *other._exprs)
+
+    def __or__(self, other: "Domain") -> "Domain":
+        # An empty domain matches everything, and so does anything ORed with it
+        if not self._exprs or not other._exprs:
+            return Domain()
+        return Domain(('|',) + self._single() + other._single())
+
+    def __bool__(self) -> bool:
+        return bool(self._exprs)
+
+    def __iter__(self) -> Iterator[Any]:
+        for expr in self._exprs:
+            yield from expr
+
+    def __repr__(self) -> str:
+        return f"Domain({list(self)!r})"
+
+    def _single(self) -> tuple:
+        """This domain as one expression, with explicit '&' where needed."""
+        return ('&',) * (len(self._exprs) - 1) + tuple(item for expr in self._exprs for item in expr)
+
+
+class D:
+    """Leaf and combinator constructors for Domain."""
+
+    @staticmethod
+    def term(field: str, operator: str, value: Any) -> Domain:
+        return Domain(((field, operator, value),))
+
+    @staticmethod
+    def eq(field: str, value: Any) -> Domain:
+        return D.term(field, '=', value)
+
+    @staticmethod
+    def ilike(field: str, value: str) -> Domain:
+        return D.term(field, 'ilike', value)
+
+    @staticmethod
+    def in_(field: str, values: list) -> Domain:
+        return D.term(field, 'in', values)
+
+    @staticmethod
+    def child_of(field: str, ids: Any) -> Domain:
+        return D.term(field, 'child_of', ids)
+
+    @staticmethod
+    def and_(*domains: Domain) -> Domain:
+        return Domain(*(expr for domain in domains for expr in domain._exprs))
+
+    @staticmethod
+    def or_(*domains: Domain) -> Domain:
+        result = domains[0]
+        for domain in domains[1:]:
+            result = result | domain
+        return result
+
+
+# Shared terms
+STORABLE_PRODUCT = D.eq('type', 'product')
+PENDING_MOVE = D.in_('state', ('assigned', 'confirmed', 'waiting'))
+INTO_STOCK = D.eq('location_dest_id', DEFAULT_LOCATION_ID)
+OUT_OF_STOCK = D.eq('location_id', DEFAULT_LOCATION_ID)
+# Open moves into or out of the stock location
+PENDING_STOCK_MOVE = PENDING_MOVE & (OUT_OF_STOCK | INTO_STOCK)
+EMPTY = Domain()
+
+
+def name_or_code(value: str) -> Domain:
+    """Products whose name or internal reference contains value."""
+    return D.ilike('name', value) | D.ilike('default_code', value)
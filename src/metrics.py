@@ -0,0 +1,87 @@
+"""
+Per-tool timing metrics.
+
+Timings are exported as a Prometheus histogram when prometheus_client is
+installed (served at /metrics by the SSE transport) and are always kept as
+running totals so the stdio transport can print a summary to stderr on
+SIGUSR1.
+"""
+
+import asyncio
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    from prometheus_client import Histogram, make_asgi_app
+except ImportError:  # pragma: no cover - optional dependency
+    Histogram = None
+    make_asgi_app = None
+
+
+TOOL_HIST = Histogram(
+    "mcp_tool_seconds",
+    "Time spent handling MCP tool calls, by phase",
+    labelnames=["tool", "phase"],
+) if Histogram is not None else None
+
+# (tool, phase) -> [count, total seconds]
+_totals: dict[tuple[str, str], list] = {}
+_totals_lock = threading.Lock()
+
+
+@contextmanager
+def time_phase(tool: str, phase: str) -> Iterator[None]:
+    """Record how long the wrapped block takes for the given tool and phase."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if TOOL_HIST is not None:
+            TOOL_HIST.labels(tool, phase).observe(elapsed)
+        with _totals_lock:
+            entry = _totals.setdefault((tool, phase), [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+
+
+def metrics_app():
+    """Return an ASGI app serving Prometheus metrics, or None if unavailable."""
+    return make_asgi_app() if make_asgi_app is not None else None
+
+
+def print_summary() -> None:
+    """Write call counts and mean latency for every tool and phase to stderr.
+
+    stdout carries the stdio transport's protocol messages, so the summary
+    goes to stderr, which MCP clients show in their server logs.
+    """
+    with _totals_lock:
+        rows = sorted(_totals.items())
+    if not rows:
+        print("No tool calls recorded yet", file=sys.stderr, flush=True)
+        return
+    lines = [
+        f"{tool} [{phase}]: {count} calls, {total:.3f}s total, {total / count * 1000:.1f}ms avg"
+        for (tool, phase), (count, total) in rows
+    ]
+    print("\n".join(lines), file=sys.stderr, flush=True)
+
+
+def install_summary_signal() -> Optional[int]:
+    """
+    Print a timing summary whenever the process receives SIGUSR1.
+
+    Must be called from the running event loop. The handler runs as a loop
+    callback rather than inside the signal handler, so it can never interrupt
+    time_phase while it holds _totals_lock.
+    """
+    sigusr1 = getattr(signal, "SIGUSR1", None)
+    if sigusr1 is None:
+        return None
+    asyncio.get_running_loop().add_signal_handler(sigusr1, print_summary)
+    return sigusr1
@@ -1,11 +1,168 @@
 """
-Odoo XML-RPC Client for inventory data access.
+Odoo RPC client (JSON-RPC or XML-RPC) for inventory data access.
 """
 
+import contextvars
+import http.client
+import itertools
+import json
+import os
+import threading
 import xmlrpc.client
-from typing import Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
 from dataclasses import dataclass
-from functools import lru_cache
+from functools import partial
+from urllib.parse import urlsplit
+
+from .cache import TTLCache
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+# Shared pool for running independent RPCs concurrently (see OdooClient.gather)
+_RPC_THREAD_PREFIX = "odoo-rpc"
+_RPC_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("ODOO_RPC_WORKERS", "8")),
+    thread_name_prefix=_RPC_THREAD_PREFIX
+)
+
+
+# Socket timeout (seconds) for Odoo RPCs, so a hung request cannot pin a worker
+_RPC_TIMEOUT = float(os.environ.get("ODOO_TIMEOUT", "120"))
+
+
+# Seconds to reuse an identical search_read result; paired tools (analyze_* and
+# get_*_summary, forecast and alerts) often repeat the same query within one
+# conversation turn. ODOO_READ_CACHE_TTL=0 disables.
+_READ_CACHE_TTL = float(os.environ.get("ODOO_READ_CACHE_TTL", "60"))
+# Total rows the read cache may hold per client; older results are evicted
+# first and larger single results (e.g. long move histories) are not cached
+_READ_CACHE_ROWS = int(os.environ.get("ODOO_READ_CACHE_ROWS", "20000"))
+
+
+def _freeze(value: Any) -> Any:
+    """Turn a domain/field list (nested lists, tuples, dicts) into a hashable key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+class _TimeoutMixin:
+    """
+    Adds a socket timeout to an xmlrpc transport.
+
+    xmlrpc's Transport already keeps its HTTP/1.1 connection open between
+    requests; since each thread has its own ServerProxy, each thread reuses
+    its own TCP (and TLS) connection across tool calls.
+    """
+
+    def __init__(self, timeout: float, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        conn = super().make_connection(host)
+        conn.timeout = self.timeout
+        return conn
+
+
+class _TimeoutTransport(_TimeoutMixin, xmlrpc.client.Transport):
+    pass
+
+
+class _TimeoutSafeTransport(_TimeoutMixin, xmlrpc.client.SafeTransport):
+    pass
+
+
+# Wire protocol for Odoo RPCs: "jsonrpc" (compact, fast to decode) or "xmlrpc"
+_PROTOCOL = os.environ.get("ODOO_PROTOCOL", "jsonrpc").lower()
+
+_RETRYABLE_DISCONNECTS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class OdooConnectionError(ConnectionError):
+    """
+    Odoo refused the login or answered with an HTTP error status.
+
+    Unlike a dropped connection, retrying with a fresh client does not help.
+    """
+
+
+class OdooError(Exception):
+    """Error reported by the Odoo server in a JSON-RPC response."""
+
+    def __init__(self, message: str, name: Optional[str] = None):
+        super().__init__(message)
+        self.name = name
+
+
+class _JsonRpcProxy:
+    """
+    Calls an Odoo service over /jsonrpc with the same interface as an
+    xmlrpc ServerProxy (proxy.execute_kw(...), proxy.authenticate(...)).
+
+    Like ServerProxy it is not thread-safe; it keeps one keep-alive HTTP
+    connection, reopened transparently if the server has closed it.
+    """
+
+    def __init__(self, url: str, service: str, timeout: float):
+        parts = urlsplit(url)
+        self._connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self._netloc = parts.netloc
+        self._path = parts.path.rstrip("/") + "/jsonrpc"
+        self._service = service
+        self._timeout = timeout
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._ids = itertools.count(1)
+
+    def __getattr__(self, method: str) -> Callable[..., Any]:
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return partial(self._call, method)
+
+    def _call(self, method: str, *args) -> Any:
+        payload = {
+            "jsonrpc": "2.0",
+            "method": "call",
+            "params": {"service": self._service, "method": method, "args": args},
+            "id": next(self._ids),
+        }
+        body = orjson.dumps(payload) if orjson else json.dumps(payload).encode()
+        try:
+            data = self._post(body)
+        except _RETRYABLE_DISCONNECTS:
+            # Idle keep-alive connection closed by the server; retry on a new one
+            data = self._post(body)
+
+        response = orjson.loads(data) if orjson else json.loads(data)
+        error = response.get("error")
+        if error:
+            details = error.get("data") or {}
+            raise OdooError(details.get("message") or error.get("message", "Odoo error"), details.get("name"))
+        return response.get("result")
+
+    def _post(self, body: bytes) -> bytes:
+        if self._conn is None:
+            self._conn = self._connection_class(self._netloc, timeout=self._timeout)
+        try:
+            self._conn.request("POST", self._path, body, {"Content-Type": "application/json"})
+            response = self._conn.getresponse()
+            data = response.read()
+        except Exception:
+            self._conn.close()
+            self._conn = None
+            raise
+        if response.status != 200:
+            raise OdooConnectionError(f"Odoo JSON-RPC returned HTTP {response.status} {response.reason}")
+        return data
 
 
 @dataclass
@@ -18,40 +175,85 @@ class OdooConfig:
 
 
 class OdooClient:
-    """Client for connecting to Odoo via XML-RPC."""
+    """
+    Client for connecting to Odoo via JSON-RPC (default) or XML-RPC.
+
+    Safe to share between threads: the proxies are not thread-safe, so each
+    thread gets its own object endpoint proxy (and HTTP connection).
+    """
 
     def __init__(self, config: OdooConfig):
         self.config = config
         self._uid: Optional[int] = None
-        self._common: Optional[xmlrpc.client.ServerProxy] = None
-        self._models: Optional[xmlrpc.client.ServerProxy] = None
+        self._common: Any = None
+        self._local = threading.local()
+        self._auth: Optional[Future] = None
+        self._read_cache = TTLCache(maxsize=512, ttl=_READ_CACHE_TTL, maxweight=_READ_CACHE_ROWS)
 
     def connect(self) -> bool:
         """Establish connection to Odoo and authenticate."""
         try:
-            self._common = xmlrpc.client.ServerProxy(
-                f"{self.config.url}/xmlrpc/2/common"
-            )
-            self._models = xmlrpc.client.ServerProxy(
-                f"{self.config.url}/xmlrpc/2/object"
-            )
+            self._common = self._server_proxy("common")
 
             # Authenticate using API key
             # With API keys, we authenticate using the username and API key
-            self._uid = self._common.authenticate(
+            uid = self._common.authenticate(
                 self.config.database,
                 self.config.username,
                 self.config.api_key,
                 {}
             )
 
-            return self._uid is not None and self._uid > 0
+            # authenticate returns False on bad credentials; keep "no uid" as
+            # None so uid keeps raising instead of sending uid=False
+            self._uid = uid or None
+            return self._uid is not None
         except Exception as e:
-            raise ConnectionError(f"Failed to connect to Odoo: {e}")
+            raise OdooConnectionError(f"Failed to connect to Odoo: {e}")
+
+    def connect_async(self) -> Future:
+        """
+        Start connect() in the background and return its future.
+
+        The caller can go on preparing its first request while the
+        authenticate round-trip is in flight; RPCs wait for it on first use
+        of uid and raise OdooConnectionError if it failed.
+        """
+        self._auth = _RPC_EXECUTOR.submit(self.connect)
+        return self._auth
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the session can be reused (authenticated, or authentication in flight)."""
+        if self._auth is not None and not self._auth.done():
+            return True
+        return bool(self._uid)
+
+    @property
+    def _models(self) -> Any:
+        """Object endpoint proxy for the calling thread."""
+        models = getattr(self._local, "models", None)
+        if models is None:
+            models = self._local.models = self._server_proxy("object")
+        return models
+
+    def _server_proxy(self, endpoint: str) -> Any:
+        """Create a proxy for an Odoo service over the configured protocol, with a timeout."""
+        if _PROTOCOL == "jsonrpc":
+            return _JsonRpcProxy(self.config.url, endpoint, _RPC_TIMEOUT)
+        url = f"{self.config.url}/xmlrpc/2/{endpoint}"
+        if url.startswith("https"):
+            transport = _TimeoutSafeTransport(_RPC_TIMEOUT)
+        else:
+            transport = _TimeoutTransport(_RPC_TIMEOUT)
+        return xmlrpc.client.ServerProxy(url, transport=transport)
 
     @property
     def uid(self) -> int:
-        """Get authenticated user ID."""
+        """Get authenticated user ID, waiting for connect_async() if pending."""
+        if self._uid is None and self._auth is not None:
+            if not self._auth.result():
+                raise OdooConnectionError("Odoo authentication failed")
         if self._uid is None:
             raise RuntimeError("Not connected. Call connect() first.")
         return self._uid
@@ -64,12 +266,10 @@ class OdooClient:
         **kwargs
     ) -> Any:
         """Execute a method on an Odoo model."""
-        if self._models is None:
-            raise RuntimeError("Not connected. Call connect() first.")
-
+        uid = self.uid  # raises if not connected
         return self._models.execute_kw(
             self.config.database,
-            self.uid,
+            uid,
             self.config.api_key,
             model,
             method,
@@ -97,12 +297,15 @@ class OdooClient:
         self,
         model: str,
         ids: list[int],
-        fields: Optional[list[str]] = None
+        fields: Optional[list[str]] = None,
+        context: Optional[dict] = None
     ) -> list[dict]:
-        """Read records by IDs."""
+        """Read records by IDs; context sets e.g. the location for stock quantities."""
         kwargs = {}
         if fields:
             kwargs["fields"] = fields
+        if context:
+            kwargs["context"] = context
         return self.execute(model, "read", ids, **kwargs)
 
     def search_read(
@@ -112,9 +315,16 @@ class OdooClient:
         fields: Optional[list[str]] = None,
         limit: Optional[int] = None,
         offset: int = 0,
-        order: Optional[str] = None
+        order: Optional[str] = None,
+        context: Optional[dict] = None
     ) -> list[dict]:
-        """Search and read records in one call."""
+        """
+        Search and read records in one call.
+
+        context is passed to Odoo, e.g. {'location': id} to compute stock
+        quantities for one location. Identical queries within
+        ODOO_READ_CACHE_TTL seconds are answered from memory.
+        """
         kwargs = {"offset": offset}
         if fields:
             kwargs["fields"] = fields
@@ -122,12 +332,49 @@ class OdooClient:
             kwargs["limit"] = limit
         if order:
             kwargs["order"] = order
-        return self.execute(model, "search_read", domain, **kwargs)
+        if context:
+            kwargs["context"] = context
+
+        key = (model, _freeze(domain), _freeze(kwargs))
+        rows = self._read_cache.get(key)
+        if rows is None:
+            rows = self.execute(model, "search_read", domain, **kwargs)
+            self._read_cache.set(key, rows, weight=len(rows))
+        # Callers may annotate the row dicts they get back; keep the cached
+        # ones pristine
+        return [dict(row) for row in rows]
 
     def search_count(self, model: str, domain: list) -> int:
         """Count records matching domain."""
         return self.execute(model, "search_count", domain)
 
+    def read_group(
+        self,
+        model: str,
+        domain: list,
+        fields: list[str],
+        groupby: list[str],
+        lazy: bool = False,
+        **kwargs
+    ) -> list[dict]:
+        """Aggregate records server-side, one row per group."""
+        return self.execute(model, "read_group", domain, fields, groupby, lazy=lazy, **kwargs)
+
+    def gather(self, *calls: Callable[[], Any]) -> list:
+        """
+        Run independent RPC calls concurrently.
+
+        Each call is a zero-argument callable (e.g. functools.partial around
+        search_read). Results are returned in the order the calls were given.
+        Calls made from inside an RPC worker run sequentially so nested
+        gathers cannot exhaust the pool. Each call runs in a copy of the
+        caller's context (cache bypass, progress reporter).
+        """
+        if threading.current_thread().name.startswith(_RPC_THREAD_PREFIX):
+            return [call() for call in calls]
+        futures = [_RPC_EXECUTOR.submit(contextvars.copy_context().run, call) for call in calls]
+        return [future.result() for future in futures]
+
     # Inventory-specific helper methods
 
     def get_products(
@@ -6,42 +6,23 @@ Supports both stdio (local) and HTTP/SSE (remote) transports.
 """
 
 import asyncio
+import http.client
+import importlib
 import os
-from typing import Any
-
+import xmlrpc.client
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
 from mcp.server import Server
 from mcp.types import Tool, TextContent, CallToolResult
 
+from .cache import TTLCache, bypass_caches
 from .config import get_odoo_client
+from .odoo_client import OdooClient, OdooConnectionError, OdooError
+from .metrics import time_phase, metrics_app, install_summary_signal
+from .workers import start_process_pool, shutdown_process_pool
 from .tools.definitions import get_tool_definitions
-from .tools.search import (
-    handle_search_categories,
-    handle_search_products,
-    handle_get_products_by_category,
-)
-from .tools.stock import (
-    handle_get_reorder_rules,
-    handle_get_stock_levels,
-    handle_get_reorder_alerts,
-    handle_get_stock_summary,
-)
-from .tools.forecast import (
-    handle_get_stock_forecast,
-    handle_forecast_demand,
-    handle_get_forecast_summary,
-)
-from .tools.lead_time import handle_get_lead_time
-from .tools.future_stock import handle_get_future_stock_alert
-from .tools.analysis import (
-    handle_analyze_abc_xyz,
-    handle_get_abc_xyz_summary,
-    handle_analyze_turnover,
-    handle_analyze_aging,
-    handle_get_turnover_summary,
-    handle_get_aging_summary,
-    handle_get_slow_moving_items,
-    handle_get_high_risk_aging_items,
-)
+from .tools._json import canonical
+from .tools._progress import ProgressReporter, progress_reporter
 
 
 # Initialize MCP server
@@ -49,78 +30,255 @@ app = Server("inventory-analysis")
 
 
 # Tool handler mapping
-TOOL_HANDLERS = {
+ToolHandler = Callable[[OdooClient, dict[str, Any]], CallToolResult]
+
+# Tool name -> module in .tools defining handle_<tool name>. Modules are
+# imported on the first call of one of their tools, so startup does not pay
+# for the NumPy/pandas/SciPy stack the forecast and analysis tools pull in.
+TOOL_MODULES: dict[str, str] = {
     # Search tools
-    "search_categories": handle_search_categories,
-    "search_products": handle_search_products,
-    "get_products_by_category": handle_get_products_by_category,
+    "search_categories": "search",
+    "search_products": "search",
+    "get_products_by_category": "search",
 
     # Stock tools
-    "get_reorder_rules": handle_get_reorder_rules,
-    "get_stock_levels": handle_get_stock_levels,
-    "get_reorder_alerts": handle_get_reorder_alerts,
-    "get_stock_summary": handle_get_stock_summary,
+    "get_reorder_rules": "stock",
+    "get_stock_levels": "stock",
+    "get_reorder_alerts": "stock",
+    "get_stock_summary": "stock",
 
     # Forecast tools
-    "get_stock_forecast": handle_get_stock_forecast,
-    "forecast_demand": handle_forecast_demand,
-    "get_forecast_summary": handle_get_forecast_summary,
+    "get_stock_forecast": "forecast",
+    "forecast_demand": "forecast",
+    "get_forecast_summary": "forecast",
 
     # Lead time tools
-    "get_lead_time": handle_get_lead_time,
+    "get_lead_time": "lead_time",
 
     # Future stock alert tools
-    "get_future_stock_alert": handle_get_future_stock_alert,
+    "get_future_stock_alert": "future_stock",
 
     # Analysis tools
-    "analyze_abc_xyz": handle_analyze_abc_xyz,
-    "get_abc_xyz_summary": handle_get_abc_xyz_summary,
-    "analyze_turnover": handle_analyze_turnover,
-    "analyze_aging": handle_analyze_aging,
-    "get_turnover_summary": handle_get_turnover_summary,
-    "get_aging_summary": handle_get_aging_summary,
-    "get_slow_moving_items": handle_get_slow_moving_items,
-    "get_high_risk_aging_items": handle_get_high_risk_aging_items,
+    "analyze_abc_xyz": "analysis",
+    "get_abc_xyz_summary": "analysis",
+    "analyze_turnover": "analysis",
+    "analyze_aging": "analysis",
+    "get_turnover_summary": "analysis",
+    "get_aging_summary": "analysis",
+    "get_slow_moving_items": "analysis",
+    "get_high_risk_aging_items": "analysis",
 }
 
+_HANDLERS: dict[str, ToolHandler] = {}
+
+
+def _get_handler(name: str) -> Optional[ToolHandler]:
+    """Return the handler for tool name, importing its module on first use."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        module = TOOL_MODULES.get(name)
+        if module is None:
+            return None
+        handler = getattr(importlib.import_module(f".tools.{module}", __package__), f"handle_{name}")
+        _HANDLERS[name] = handler
+    return handler
+
+
+# Tool list is static, build it once at import
+_TOOLS: list[Tool] = get_tool_definitions()
+
+
+# Recent successful tool results keyed by (tool, canonical arguments). Clients
+# often call several overlapping tools in one turn; a short TTL keeps answers
+# fresh while letting repeats skip Odoo entirely. MCP_RESULT_CACHE_TTL=0 disables;
+# a call with no_cache=true bypasses it (and the lower-level caches).
+_RESULT_CACHE = TTLCache(
+    maxsize=256,
+    ttl=float(os.environ.get("MCP_RESULT_CACHE_TTL", "30"))
+)
+
+
+def _result_cache_key(name: str, arguments: dict[str, Any]) -> tuple[str, bytes]:
+    """Cache key for a tool call; argument order does not matter."""
+    return name, canonical(arguments)
+
+
+# Caps tool handlers running against Odoo at once; excess calls wait here
+# instead of piling up XML-RPC connections on the server
+_ODOO_SLOTS = asyncio.Semaphore(int(os.environ.get("MCP_CONCURRENCY", "8")))
+
+
+async def _run_handler(name: str, handler: Callable, client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
+    """Run a handler in a worker thread once an Odoo slot is free, timing the wait as "queue"."""
+    with time_phase(name, "queue"):
+        await _ODOO_SLOTS.acquire()
+    try:
+        with time_phase(name, "handler"):
+            return await asyncio.to_thread(handler, client, arguments)
+    finally:
+        _ODOO_SLOTS.release()
+
+
+def _err(message: str) -> CallToolResult:
+    """Error result with a single text block; fields are known-valid, so skip validation."""
+    return CallToolResult.model_construct(
+        content=[TextContent.model_construct(type="text", text=message)],
+        isError=True
+    )
+
+
+# Process-wide Odoo client, connected lazily and reused across tool calls
+_CLIENT: Optional[OdooClient] = None
+_CLIENT_LOCK = asyncio.Lock()
+
+# Dropped or refused connections after which the cached client is dropped and
+# the call retried once. Timeouts (the call already waited ODOO_TIMEOUT),
+# failed logins and HTTP error statuses (OdooConnectionError) are not retried.
+_RECONNECT_ERRORS = (
+    xmlrpc.client.ProtocolError,
+    ConnectionResetError,
+    ConnectionRefusedError,
+    BrokenPipeError,
+    http.client.RemoteDisconnected,
+)
+# Odoo errors that mean the session/credentials went stale rather than the
+# request being wrong: XML-RPC fault code 3 (AccessDenied) and the matching
+# JSON-RPC exception names. Any other server error (invalid field, access
+# rights, validation) would fail the same way again, so it is not retried.
+_SESSION_FAULT_CODES = frozenset({3})
+_SESSION_ERROR_NAMES = frozenset({
+    "odoo.exceptions.AccessDenied",
+    "odoo.http.SessionExpiredException",
+})
+
+
+def _needs_reconnect(error: Exception) -> bool:
+    """Whether error calls for a fresh client and one retry of the handler."""
+    if isinstance(error, (TimeoutError, OdooConnectionError)):
+        return False
+    if isinstance(error, _RECONNECT_ERRORS):
+        return True
+    if isinstance(error, xmlrpc.client.Fault):
+        return error.faultCode in _SESSION_FAULT_CODES
+    if isinstance(error, OdooError):
+        return error.name in _SESSION_ERROR_NAMES
+    return False
+
+
+async def _get_client() -> OdooClient:
+    """Return the shared Odoo client, connecting on first use."""
+    global _CLIENT
+    async with _CLIENT_LOCK:
+        if _CLIENT is None or not _CLIENT.is_connected:
+            # Authenticate in the background; the handler starts right away
+            # and its first RPC waits for the uid
+            _CLIENT = get_odoo_client(wait=False)
+        return _CLIENT
+
+
+async def _reset_client() -> None:
+    """Drop the shared Odoo client so the next call reconnects."""
+    global _CLIENT
+    async with _CLIENT_LOCK:
+        _CLIENT = None
+
+
+def _make_progress_reporter() -> Optional[ProgressReporter]:
+    """Build a thread-safe progress callback for the current request, if the client sent a progress token."""
+    try:
+        ctx = app.request_context
+    except LookupError:
+        return None
+    token = ctx.meta.progressToken if ctx.meta else None
+    if token is None:
+        return None
+
+    loop = asyncio.get_running_loop()
+
+    def report(progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+        asyncio.run_coroutine_threadsafe(
+            ctx.session.send_progress_notification(
+                token, progress, total, message, related_request_id=str(ctx.request_id)
+            ),
+            loop
+        )
+
+    return report
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List all available inventory analysis tools."""
-    return get_tool_definitions()
+    return _TOOLS
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> CallToolResult:
     """Handle tool calls."""
-    try:
-        client = get_odoo_client()
+    # Resolve the handler first so unknown names never open a connection
+    # (or create metric series)
+    if name not in TOOL_MODULES:
+        return _err(f"Unknown tool: {name}")
+    # A tool's first call imports its module; keep that off the event loop
+    handler = _HANDLERS.get(name) or await asyncio.to_thread(_get_handler, name)
 
-        handler = TOOL_HANDLERS.get(name)
-        if handler:
-            return handler(client, arguments)
-        else:
-            return CallToolResult(
-                content=[TextContent(
-                    type="text",
-                    text=f"Unknown tool: {name}"
-                )],
-                isError=True
-            )
+    try:
+        # no_cache makes every cache miss for this call (tool results, Odoo
+        # reads, analyses, category lookups); fresh results replace them
+        no_cache = bool(arguments.get("no_cache"))
+        if "no_cache" in arguments:
+            arguments = {k: v for k, v in arguments.items() if k != "no_cache"}
+        cache_key = _result_cache_key(name, arguments)
+        with bypass_caches(no_cache):
+            cached = _RESULT_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
+            with time_phase(name, "connect"):
+                client = await _get_client()
+
+            # Handlers issue blocking XML-RPC calls; run them in a worker
+            # thread so other MCP requests keep progressing meanwhile. The
+            # thread inherits the progress reporter and cache bypass through
+            # its context.
+            with progress_reporter(_make_progress_reporter()):
+                try:
+                    result = await _run_handler(name, handler, client, arguments)
+                except Exception as error:
+                    if not _needs_reconnect(error):
+                        raise
+                    # Stale session or dropped connection: reconnect and retry once
+                    await _reset_client()
+                    with time_phase(name, "connect"):
+                        client = await _get_client()
+                    result = await _run_handler(name, handler, client, arguments)
+
+            if not result.isError:
+                _RESULT_CACHE.set(cache_key, result)
+            return result
 
     except Exception as e:
-        return CallToolResult(
-            content=[TextContent(
-                type="text",
-                text=f"Error: {str(e)}"
-            )],
-            isError=True
-        )
+        return _err(f"Error: {e}")
+
+
+def _install_default_executor() -> None:
+    """
+    Size the loop's default executor, which runs the tool handlers.
+
+    The MCP session dispatches requests concurrently; each in-flight tool
+    call holds one of these threads while it waits on Odoo.
+    """
+    workers = int(os.environ.get("MCP_WORKER_THREADS", "16"))
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-tool")
+    )
 
 
 async def run_stdio():
     """Run the MCP server with stdio transport (for local use)."""
     from mcp.server.stdio import stdio_server
+    _install_default_executor()
+    install_summary_signal()
     async with stdio_server() as (read_stream, write_stream):
         await app.run(
             read_stream,
@@ -137,6 +295,7 @@ async def run_sse(host: str = "0.0.0.0", port: int = 8000):
     from starlette.responses import JSONResponse, PlainTextResponse
     import uvicorn
 
+    _install_default_executor()
     sse = SseServerTransport("/messages/")
 
     async def handle_sse(request):
@@ -156,35 +315,62 @@ async def run_sse(host: str = "0.0.0.0", port: int = 8000):
     async def root(request):
         return PlainTextResponse("Odoo Inventory Analysis MCP Server is running. Connect via /sse endpoint.")
 
-    starlette_app = Starlette(
-        debug=False,
-        routes=[
-            Route("/", root),
-            Route("/health", health_check),
-            Route("/sse", handle_sse),
-            Mount("/messages/", routes=[Route("/", handle_messages, methods=["POST"])]),
-        ],
+    routes = [
+        Route("/", root),
+        Route("/health", health_check),
+        Route("/sse", handle_sse),
+        Mount("/messages/", routes=[Route("/", handle_messages, methods=["POST"])]),
+    ]
+    metrics = metrics_app()
+    if metrics is not None:
+        routes.append(Mount("/metrics", app=metrics))
+
+    starlette_app = Starlette(debug=False, routes=routes)
+
+    # "auto" picks httptools when installed. Keep idle client connections open
+    # long enough to span a conversation's gaps between tool calls.
+    max_connections = os.environ.get("MCP_HTTP_MAX_CONNECTIONS")
+    config = uvicorn.Config(
+        starlette_app,
+        host=host,
+        port=port,
+        log_level="info",
+        http="auto",
+        timeout_keep_alive=75,
+        limit_concurrency=int(max_connections) if max_connections else None,
     )
-
-    config = uvicorn.Config(starlette_app, host=host, port=port, log_level="info")
     server = uvicorn.Server(config)
     await server.serve()
 
 
+def _run_event_loop(coro) -> None:
+    """Run coro to completion, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(coro)
+    else:
+        uvloop.run(coro)
+
+
 def main():
     """Main entry point - determines transport based on environment."""
-    import sys
-
-    # Check if PORT is set (Railway sets this) or MCP_TRANSPORT is sse
-    port = os.environ.get("PORT")
-    if port or os.environ.get("MCP_TRANSPORT", "stdio") == "sse":
-        port = int(port or 8000)
-        host = os.environ.get("HOST", "0.0.0.0")
-        print(f"Starting MCP server with SSE transport on {host}:{port}")
-        asyncio.run(run_sse(host=host, port=port))
-    else:
-        # Default to stdio for local use
-        asyncio.run(run_stdio())
+    # Start forecast workers before any threads exist
+    start_process_pool()
+
+    try:
+        # Check if PORT is set (Railway sets this) or MCP_TRANSPORT is sse
+        port = os.environ.get("PORT")
+        if port or os.environ.get("MCP_TRANSPORT", "stdio") == "sse":
+            port = int(port or 8000)
+            host = os.environ.get("HOST", "0.0.0.0")
+            print(f"Starting MCP server with SSE transport on {host}:{port}")
+            _run_event_loop(run_sse(host=host, port=port))
+        else:
+            # Default to stdio for local use
+            asyncio.run(run_stdio())
+    finally:
+        shutdown_process_pool()
 
 
 if __name__ == "__main__":
@@ -2,43 +2,41 @@
 Tools package for MCP server.
 """
 
-from .definitions import get_tool_definitions
-from .search import handle_search_categories, handle_search_products, handle_get_products_by_category
-from .stock import handle_get_stock_levels, handle_get_reorder_alerts, handle_get_stock_summary, handle_get_reorder_rules
-from .forecast import handle_get_stock_forecast, handle_forecast_demand, handle_get_forecast_summary
-from .lead_time import handle_get_lead_time
-from .future_stock import handle_get_future_stock_alert
-from .analysis import (
-    handle_analyze_abc_xyz,
-    handle_get_abc_xyz_summary,
-    handle_analyze_turnover,
-    handle_analyze_aging,
-    handle_get_turnover_summary,
-    handle_get_aging_summary,
-    handle_get_slow_moving_items,
-    handle_get_high_risk_aging_items,
-)
+# Handler modules are imported on first attribute access (PEP 562) so that,
+# e.g., importing tools.definitions does not load every handler.
+import importlib
 
-__all__ = [
-    'get_tool_definitions',
-    'handle_search_categories',
-    'handle_search_products',
-    'handle_get_products_by_category',
-    'handle_get_stock_levels',
-    'handle_get_reorder_alerts',
-    'handle_get_stock_summary',
-    'handle_get_reorder_rules',
-    'handle_get_stock_forecast',
-    'handle_forecast_demand',
-    'handle_get_forecast_summary',
-    'handle_get_lead_time',
-    'handle_get_future_stock_alert',
-    'handle_analyze_abc_xyz',
-    'handle_get_abc_xyz_summary',
-    'handle_analyze_turnover',
-    'handle_analyze_aging',
-    'handle_get_turnover_summary',
-    'handle_get_aging_summary',
-    'handle_get_slow_moving_items',
-    'handle_get_high_risk_aging_items',
-]
+_EXPORTS = {
+    'get_tool_definitions': '.definitions',
+    'handle_search_categories': '.search',
+    'handle_search_products': '.search',
+    'handle_get_products_by_category': '.search',
+    'handle_get_stock_levels': '.stock',
+    'handle_get_reorder_alerts': '.stock',
+    'handle_get_stock_summary': '.stock',
+    'handle_get_reorder_rules': '.stock',
+    'handle_get_stock_forecast': '.forecast',
+    'handle_forecast_demand': '.forecast',
+    'handle_get_forecast_summary': '.forecast',
+    'handle_get_lead_time': '.lead_time',
+    'handle_get_future_stock_alert': '.future_stock',
+    'handle_analyze_abc_xyz': '.analysis',
+    'handle_get_abc_xyz_summary': '.analysis',
+    'handle_analyze_turnover': '.analysis',
+    'handle_analyze_aging': '.analysis',
+    'handle_get_turnover_summary': '.analysis',
+    'handle_get_aging_summary': '.analysis',
+    'handle_get_slow_moving_items': '.analysis',
+    'handle_get_high_risk_aging_items': '.analysis',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,34 @@
+"""
+Short-lived cache of analyzer results shared between tools.
+"""
+
+import os
+from typing import Any
+
+from ..cache import TTLCache
+from ._json import canonical
+
+
+# Analyzer results keyed by (analyzer, method, arguments). The analyze_*,
+# get_*_summary and filter tools for one analysis share a result, so calling
+# them back to back runs the Odoo walk once.
+_ANALYSIS_CACHE = TTLCache(
+    maxsize=32,
+    ttl=float(os.environ.get("ANALYSIS_CACHE_TTL", "60"))
+)
+
+
+def run_analysis(analyzer: Any, method: str, /, executor: Any = None, **kwargs: Any) -> list:
+    """
+    Call analyzer.<method>(**kwargs), reusing a recent result for the same call.
+
+    executor, if given, is passed through but is not part of the cache key.
+    """
+    key = (type(analyzer).__name__, method, canonical(kwargs))
+    results = _ANALYSIS_CACHE.get(key)
+    if results is None:
+        if executor is not None:
+            kwargs["executor"] = executor
+        results = getattr(analyzer, method)(**kwargs)
+        _ANALYSIS_CACHE.set(key, results)
+    return results
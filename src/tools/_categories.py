@@ -0,0 +1,84 @@
+"""
+Category name resolution shared by the tool handlers.
+"""
+
+import logging
+import os
+import time
+from typing import Optional
+
+from ..cache import TTLCache
+from ..domain import D, EMPTY, Domain
+from ..odoo_client import OdooClient
+
+
+logger = logging.getLogger(__name__)
+
+# Most categories a name lookup resolves to
+CATEGORY_MATCH_LIMIT = 10
+
+# Lookups slower than this (seconds) are logged
+_SLOW_LOOKUP_SECONDS = 1.0
+
+# Filter products on the category path server-side (one RPC) instead of
+# resolving category ids first. Disable for Odoo versions where
+# product.category.complete_name is not searchable.
+_DOTTED_CATEGORY_DOMAIN = os.environ.get("ODOO_DOTTED_CATEGORY_DOMAIN", "1").lower() not in ("0", "false", "no")
+
+# Category name -> matching category rows. Categories rarely change, so a short
+# TTL keeps repeated lookups off the network while still picking up edits.
+_CATEGORY_CACHE = TTLCache(
+    maxsize=1024,
+    ttl=float(os.environ.get("CATEGORY_CACHE_TTL", "300"))
+)
+
+
+def find_categories(client: OdooClient, name: str) -> list[dict]:
+    """
+    Return up to CATEGORY_MATCH_LIMIT categories whose full path matches name
+    (case-insensitive), as id/name/complete_name rows.
+    """
+    categories = _CATEGORY_CACHE.get(name)
+    if categories is None:
+        start = time.perf_counter()
+        categories = client.search_read(
+            'product.category',
+            [('complete_name', 'ilike', name)],
+            ['id', 'name', 'complete_name'],
+            limit=CATEGORY_MATCH_LIMIT
+        )
+        elapsed = time.perf_counter() - start
+        if elapsed > _SLOW_LOOKUP_SECONDS:
+            logger.warning("Slow category lookup for %r: %.2fs", name, elapsed)
+        categories = tuple(categories)
+        _CATEGORY_CACHE.set(name, categories)
+    return [dict(c) for c in categories]
+
+
+def resolve_category_ids(client: OdooClient, name: Optional[str]) -> Optional[list[int]]:
+    """
+    Return ids of categories whose full path matches name (case-insensitive).
+
+    Returns None when no name is given, so callers can skip the filter.
+    """
+    if not name:
+        return None
+    return [c['id'] for c in find_categories(client, name)]
+
+
+def category_domain(client: OdooClient, name: Optional[str]) -> Domain:
+    """
+    Product domain terms restricting products to categories matching name.
+
+    Subcategories are included: their full path contains the parent's name.
+    A name that matches no category yields a domain that matches no product;
+    no name yields an empty domain (no filter).
+    """
+    if not name:
+        return EMPTY
+    if _DOTTED_CATEGORY_DOMAIN:
+        return D.ilike('categ_id.complete_name', name)
+    cat_ids = resolve_category_ids(client, name)
+    if cat_ids:
+        return D.child_of('categ_id', cat_ids)
+    return D.in_('categ_id', [])
@@ -0,0 +1,68 @@
+"""
+JSON encoding for tool responses.
+"""
+
+import dataclasses
+import json
+import os
+from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+_PRETTY = os.environ.get("MCP_PRETTY", "").lower() in ("1", "true", "yes")
+
+if orjson is not None:
+    # Compact output on the wire; set MCP_PRETTY=1 for indented JSON when debugging
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if _PRETTY:
+        _OPTIONS |= orjson.OPT_INDENT_2
+
+
+@lru_cache(maxsize=None)
+def _dataclass_encoder(cls: type) -> Callable[[Any], dict]:
+    """Build a dataclass -> dict converter once per class (no asdict deep copy)."""
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    if len(names) == 1:
+        name = names[0]
+        return lambda obj: {name: getattr(obj, name)}
+    values = attrgetter(*names)
+    return lambda obj: dict(zip(names, values(obj)))
+
+
+def _default(obj: Any) -> Any:
+    """Encode values the stdlib encoder does not know (dataclasses, Enums, NumPy)."""
+    if dataclasses.is_dataclass(obj):
+        return _dataclass_encoder(type(obj))(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize a tool response payload to a JSON string.
+
+    Analyzer result dataclasses (and their Enum fields) can be passed as-is:
+    orjson encodes them natively, the stdlib fallback via _default.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=_OPTIONS).decode()
+    if _PRETTY:
+        return json.dumps(obj, indent=2, default=_default)
+    return json.dumps(obj, separators=(",", ":"), default=_default)
+
+
+def canonical(obj: Any) -> bytes:
+    """Stable encoding of obj with sorted keys, for use as a cache key."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode()
@@ -0,0 +1,36 @@
+"""
+Progress reporting for long-running tool handlers.
+
+Handlers run in worker threads and know nothing about the MCP session, so the
+server installs a reporter in a context variable for the duration of a call
+(asyncio.to_thread copies it into the worker). Handlers call report_progress()
+as pages of data arrive; it is a no-op when the client did not ask for
+progress notifications.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+
+# (progress, total, message) -> None
+ProgressReporter = Callable[[float, Optional[float], Optional[str]], None]
+
+_REPORTER: ContextVar[Optional[ProgressReporter]] = ContextVar("progress_reporter", default=None)
+
+
+def report_progress(progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+    """Send a progress notification for the current tool call, if requested."""
+    reporter = _REPORTER.get()
+    if reporter is not None:
+        reporter(progress, total, message)
+
+
+@contextmanager
+def progress_reporter(reporter: Optional[ProgressReporter]) -> Iterator[None]:
+    """Install reporter for the current tool call."""
+    token = _REPORTER.set(reporter)
+    try:
+        yield
+    finally:
+        _REPORTER.reset(token)
@@ -0,0 +1,29 @@
+"""
+Top supplier lookup shared by the tool handlers.
+"""
+
+from ..domain import D
+from ..odoo_client import OdooClient
+
+
+def top_suppliers(client: OdooClient, product_tmpl_ids: list[int], fields: list[str]) -> dict[int, dict]:
+    """
+    Return the top (lowest sequence, then lowest id) supplierinfo row of each
+    product template, keyed by template id.
+
+    One search_read ordered by template and sequence; the first row seen per
+    template is its top supplier.
+    """
+    if not product_tmpl_ids:
+        return {}
+    suppliers = client.search_read(
+        'product.supplierinfo',
+        list(D.in_('product_tmpl_id', product_tmpl_ids)),
+        ['product_tmpl_id'] + fields,
+        order='product_tmpl_id, sequence, id'
+    )
+
+    supplier_by_tmpl = {}
+    for si in suppliers:
+        supplier_by_tmpl.setdefault(si['product_tmpl_id'][0], si)
+    return supplier_by_tmpl
@@ -5,447 +5,482 @@ Tool definitions (schemas) for all MCP tools.
 from mcp.types import Tool
 
 
-def get_tool_definitions() -> list[Tool]:
-    """Return all tool definitions."""
+# Input schemas are static, so they are built once at import
+
+# Property definitions shared by several schemas
+_PRODUCT_IDS_PROP = {
+    "type": "array",
+    "items": {"type": "integer"},
+    "description": "Optional list of product IDs"
+}
+_CATEGORY_IDS_PROP = {
+    "type": "array",
+    "items": {"type": "integer"},
+    "description": "Optional list of category IDs"
+}
+_PRODUCT_NAME_PROP = {
+    "type": "string",
+    "description": "Product name to search for (partial match)"
+}
+_WAREHOUSE_ID_PROP = {
+    "type": "integer",
+    "description": "Optional warehouse ID to filter"
+}
+_CATEGORY_NAME_PROP = {
+    "type": "string",
+    "description": "Category name to filter products"
+}
+# Accepted by every tool; handled by the server, which bypasses all caches
+_NO_CACHE_PROP = {
+    "type": "boolean",
+    "default": False,
+    "description": "Ignore cached data (tool results, Odoo reads, analyses, category lookups) and read fresh data from Odoo"
+}
+
+_SCHEMA_SEARCH_CATEGORIES = {
+    "type": "object",
+    "properties": {
+        "name": {
+            "type": "string",
+            "description": "Category name to search for (partial match supported)"
+        }
+    },
+    "required": ["name"]
+}
+
+_SCHEMA_SEARCH_PRODUCTS = {
+    "type": "object",
+    "properties": {
+        "name": {
+            "type": "string",
+            "description": "Product name or code to search for (partial match supported)"
+        },
+        "product_id": {
+            "type": "integer",
+            "description": "Product ID to search for (exact match)"
+        },
+        "category_name": {
+            "type": "string",
+            "description": "Optional category name to filter products"
+        }
+    }
+}
+
+_SCHEMA_GET_PRODUCTS_BY_CATEGORY = {
+    "type": "object",
+    "properties": {
+        "category_name": {
+            "type": "string",
+            "description": "Category name to search for (e.g., 'Colour / Durasafe')"
+        },
+        "include_subcategories": {
+            "type": "boolean",
+            "default": True,
+            "description": "Include products from subcategories"
+        },
+        "limit": {
+            "type": "integer",
+            "default": 500,
+            "minimum": 1,
+            "maximum": 5000,
+            "description": "Maximum number of products to return"
+        },
+        "offset": {
+            "type": "integer",
+            "default": 0,
+            "minimum": 0,
+            "description": "Number of products to skip (for paging)"
+        },
+        "fields": {
+            "type": "array",
+            "items": {
+                "type": "string",
+                "enum": ["on_hand", "forecasted", "incoming", "outgoing", "minimum", "pending_forecast", "require"]
+            },
+            "default": ["on_hand", "minimum", "pending_forecast", "require"],
+            "description": "Quantity columns to return besides id, name and code. Every column is computed by Odoo: minimum is cheap, on_hand moderate, forecasted/incoming/outgoing/pending_forecast/require expensive. Request only what you need."
+        }
+    },
+    "required": ["category_name"]
+}
+
+_SCHEMA_GET_REORDER_RULES = {
+    "type": "object",
+    "properties": {
+        "product_name": _PRODUCT_NAME_PROP,
+        "category_name": _CATEGORY_NAME_PROP,
+        "only_below_minimum": {
+            "type": "boolean",
+            "default": False,
+            "description": "Only show products below minimum stock level"
+        },
+        "fields": {
+            "type": "array",
+            "items": {"type": "string", "enum": ["forecasted"]},
+            "default": [],
+            "description": "Optional extra columns. forecasted (virtual stock) is expensive to compute in Odoo; request it only when needed."
+        }
+    }
+}
+
+_SCHEMA_GET_STOCK_LEVELS = {
+    "type": "object",
+    "properties": {
+        "product_ids": {
+            "type": "array",
+            "items": {"type": "integer"},
+            "description": "Optional list of product IDs to filter"
+        },
+        "category_ids": {
+            "type": "array",
+            "items": {"type": "integer"},
+            "description": "Optional list of category IDs to filter"
+        },
+        "warehouse_id": _WAREHOUSE_ID_PROP,
+        "include_zero_stock": {
+            "type": "boolean",
+            "default": False,
+            "description": "Include products with zero stock"
+        }
+    }
+}
+
+_SCHEMA_GET_REORDER_ALERTS = {
+    "type": "object",
+    "properties": {
+        "threshold_days": {
+            "type": "integer",
+            "default": 7,
+            "description": "Alert when days of stock is below this value"
+        },
+        "warehouse_id": _WAREHOUSE_ID_PROP
+    }
+}
+
+_SCHEMA_GET_STOCK_SUMMARY = {
+    "type": "object",
+    "properties": {
+        "warehouse_id": _WAREHOUSE_ID_PROP
+    }
+}
+
+_SCHEMA_GET_STOCK_FORECAST = {
+    "type": "object",
+    "properties": {
+        "product_name": _PRODUCT_NAME_PROP,
+        "category_name": _CATEGORY_NAME_PROP,
+        "category_ids": {
+            "type": "array",
+            "items": {"type": "integer"},
+            "description": "Category IDs to filter products (subcategories included); used instead of category_name"
+        },
+        "weeks": {
+            "type": "integer",
+            "default": 4,
+            "description": "Number of weeks to forecast (1-12)"
+        }
+    }
+}
+
+_SCHEMA_FORECAST_DEMAND = {
+    "type": "object",
+    "properties": {
+        "product_ids": {
+            "type": "array",
+            "items": {"type": "integer"},
+            "description": "Optional list of product IDs (default: all products with history, max 100)"
+        },
+        "periods": {
+            "type": "integer",
+            "default": 30,
+            "description": "Number of periods to forecast"
+        },
+        "period_type": {
+            "type": "string",
+            "enum": ["day", "week", "month"],
+            "default": "day",
+            "description": "Granularity of forecast"
+        },
+        "method": {
+            "type": "string",
+            "enum": ["auto", "moving_average", "exponential_smoothing", "linear_regression", "holt_winters"],
+            "default": "auto",
+            "description": "Forecasting method (auto selects best)"
+        },
+        "historical_days": {
+            "type": "integer",
+            "default": 365,
+            "description": "Days of historical data to use"
+        }
+    }
+}
+
+_SCHEMA_GET_FORECAST_SUMMARY = {
+    "type": "object",
+    "properties": {
+        "product_ids": _PRODUCT_IDS_PROP,
+        "periods": {
+            "type": "integer",
+            "default": 30,
+            "description": "Number of periods to forecast"
+        },
+        "period_type": {
+            "type": "string",
+            "enum": ["day", "week", "month"],
+            "default": "day"
+        }
+    }
+}
+
+_SCHEMA_GET_LEAD_TIME = {
+    "type": "object",
+    "properties": {
+        "product_name": _PRODUCT_NAME_PROP,
+        "category_name": {
+            "type": "string",
+            "description": "Category name to filter products (e.g., 'Durasafe', 'Laminex')"
+        }
+    }
+}
+
+_SCHEMA_GET_FUTURE_STOCK_ALERT = {
+    "type": "object",
+    "properties": {
+        "target_date": {
+            "type": "string",
+            "description": "Target date to check stock levels (format: YYYY-MM-DD, e.g., '2025-07-26')"
+        },
+        "threshold": {
+            "type": "number",
+            "default": 50,
+            "description": "Stock threshold - products with projected stock at or below this will be flagged as low"
+        },
+        "category_name": {
+            "type": "string",
+            "description": "Category name to filter products (e.g., 'Durasafe', 'Laminex')"
+        },
+        "product_name": _PRODUCT_NAME_PROP,
+        "exclude_keywords": {
+            "type": "array",
+            "items": {"type": "string"},
+            "default": ["TBA", "Non Stock", "DISC"],
+            "description": "Keywords to exclude from product names (default: TBA, Non Stock, DISC). Pass empty array [] to include all products."
+        }
+    },
+    "required": ["target_date"]
+}
+
+_SCHEMA_ANALYZE_ABC_XYZ = {
+    "type": "object",
+    "properties": {
+        "product_ids": _PRODUCT_IDS_PROP,
+        "category_ids": _CATEGORY_IDS_PROP,
+        "analysis_period_days": {
+            "type": "integer",
+            "default": 365,
+            "description": "Historical period for analysis"
+        }
+    }
+}
+
+_SCHEMA_GET_ABC_XYZ_SUMMARY = {
+    "type": "object",
+    "properties": {
+        "product_ids": _PRODUCT_IDS_PROP,
+        "category_ids": _CATEGORY_IDS_PROP
+    }
+}
+
+_SCHEMA_ANALYZE_TURNOVER = {
+    "type": "object",
+    "properties": {
+        "product_ids": _PRODUCT_IDS_PROP,
+        "category_ids": _CATEGORY_IDS_PROP,
+        "analysis_period_days": {
+            "type": "integer",
+            "default": 365,
+            "description": "Period for COGS calculation"
+        }
+    }
+}
+
+_SCHEMA_ANALYZE_AGING = {
+    "type": "object",
+    "properties": {
+        "product_ids": _PRODUCT_IDS_PROP,
+        "category_ids": _CATEGORY_IDS_PROP
+    }
+}
+
+_SCHEMA_GET_TURNOVER_SUMMARY = {
+    "type": "object",
+    "properties": {
+        "product_ids": _PRODUCT_IDS_PROP,
+        "category_ids": _CATEGORY_IDS_PROP
+    }
+}
+
+_SCHEMA_GET_AGING_SUMMARY = {
+    "type": "object",
+    "properties": {
+        "product_ids": _PRODUCT_IDS_PROP,
+        "category_ids": _CATEGORY_IDS_PROP
+    }
+}
+
+_SCHEMA_GET_SLOW_MOVING_ITEMS = {
+    "type": "object",
+    "properties": {
+        "min_value": {
+            "type": "number",
+            "default": 0,
+            "description": "Minimum stock value to include"
+        },
+        "category_ids": _CATEGORY_IDS_PROP
+    }
+}
+
+_SCHEMA_GET_HIGH_RISK_AGING_ITEMS = {
+    "type": "object",
+    "properties": {
+        "min_value": {
+            "type": "number",
+            "default": 0,
+            "description": "Minimum stock value to include"
+        },
+        "category_ids": _CATEGORY_IDS_PROP
+    }
+}
+
+
+def _build_tool_definitions() -> list[Tool]:
+    """Construct all tool definitions."""
     return [
         # Search Tools
         Tool(
             name="search_categories",
             description="Search for product categories by name. Use this to find category IDs before querying stock levels or other analysis. Returns category ID, name, and parent category.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Category name to search for (partial match supported)"
-                    }
-                },
-                "required": ["name"]
-            }
+            inputSchema=_SCHEMA_SEARCH_CATEGORIES
         ),
         Tool(
             name="search_products",
             description="Search for products by name or code. Use this to find product IDs before querying stock levels or other analysis. Returns product ID, name, code, category, and current stock.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Product name or code to search for (partial match supported)"
-                    },
-                    "product_id": {
-                        "type": "integer",
-                        "description": "Product ID to search for (exact match)"
-                    },
-                    "category_name": {
-                        "type": "string",
-                        "description": "Optional category name to filter products"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_SEARCH_PRODUCTS
         ),
         Tool(
             name="get_products_by_category",
-            description="Get all products in a category by category name. Returns product list with ID, name, code, on_hand, minimum stock, pending_forecast, and require (quantity to order).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "category_name": {
-                        "type": "string",
-                        "description": "Category name to search for (e.g., 'Colour / Durasafe')"
-                    },
-                    "include_subcategories": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "Include products from subcategories"
-                    }
-                },
-                "required": ["category_name"]
-            }
+            description="Get all products in a category by category name. Returns product list with ID, name, code, on_hand, minimum stock, pending_forecast, and require (quantity to order); use fields to choose the quantity columns. Results are paged: use offset and limit, and check has_more for further pages. Summary totals cover the returned page.",
+            inputSchema=_SCHEMA_GET_PRODUCTS_BY_CATEGORY
         ),
 
         # Stock Tools
         Tool(
             name="get_reorder_rules",
-            description="Get minimum stock levels (reorder points) for products. Shows product min/max quantities, reorder rules, and current stock vs minimum threshold.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_name": {
-                        "type": "string",
-                        "description": "Product name to search for (partial match)"
-                    },
-                    "category_name": {
-                        "type": "string",
-                        "description": "Category name to filter products"
-                    },
-                    "only_below_minimum": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "Only show products below minimum stock level"
-                    }
-                }
-            }
+            description="Get minimum stock levels (reorder points) for products. Shows product min/max quantities, reorder rules, and current stock vs minimum threshold. Add 'forecasted' to fields for forecasted stock.",
+            inputSchema=_SCHEMA_GET_REORDER_RULES
         ),
         Tool(
             name="get_stock_levels",
             description="Get current stock levels for products with status classification (out of stock, critical, low, normal, overstock). Shows quantities on hand, incoming, outgoing, and forecast.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of product IDs to filter"
-                    },
-                    "category_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of category IDs to filter"
-                    },
-                    "warehouse_id": {
-                        "type": "integer",
-                        "description": "Optional warehouse ID to filter"
-                    },
-                    "include_zero_stock": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "Include products with zero stock"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_STOCK_LEVELS
         ),
         Tool(
             name="get_reorder_alerts",
             description="Get products that need reordering based on stock levels and reorder rules. Returns items that are out of stock, critical, low, or have less than threshold days of stock.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "threshold_days": {
-                        "type": "integer",
-                        "default": 7,
-                        "description": "Alert when days of stock is below this value"
-                    },
-                    "warehouse_id": {
-                        "type": "integer",
-                        "description": "Optional warehouse ID to filter"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_REORDER_ALERTS
         ),
         Tool(
             name="get_stock_summary",
             description="Get summary statistics of stock levels including total products, total value, status breakdown, and products needing reorder.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "warehouse_id": {
-                        "type": "integer",
-                        "description": "Optional warehouse ID to filter"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_STOCK_SUMMARY
         ),
 
         # Forecast Tools
         Tool(
             name="get_stock_forecast",
             description="Get pending stock forecast for products showing scheduled incoming and outgoing moves for a specific number of weeks. Shows what stock will be after pending moves.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_name": {
-                        "type": "string",
-                        "description": "Product name to search for (partial match)"
-                    },
-                    "category_name": {
-                        "type": "string",
-                        "description": "Category name to filter products"
-                    },
-                    "weeks": {
-                        "type": "integer",
-                        "default": 4,
-                        "description": "Number of weeks to forecast (1-12)"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_STOCK_FORECAST
         ),
         Tool(
             name="forecast_demand",
             description="Forecast future demand for products using time series analysis. Supports moving average, exponential smoothing, linear regression, and Holt-Winters methods.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of product IDs (default: all products with history, max 100)"
-                    },
-                    "periods": {
-                        "type": "integer",
-                        "default": 30,
-                        "description": "Number of periods to forecast"
-                    },
-                    "period_type": {
-                        "type": "string",
-                        "enum": ["day", "week", "month"],
-                        "default": "day",
-                        "description": "Granularity of forecast"
-                    },
-                    "method": {
-                        "type": "string",
-                        "enum": ["auto", "moving_average", "exponential_smoothing", "linear_regression", "holt_winters"],
-                        "default": "auto",
-                        "description": "Forecasting method (auto selects best)"
-                    },
-                    "historical_days": {
-                        "type": "integer",
-                        "default": 365,
-                        "description": "Days of historical data to use"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_FORECAST_DEMAND
         ),
         Tool(
             name="get_forecast_summary",
             description="Get summary of demand forecasts including total forecasted demand, trend breakdown, and accuracy metrics.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of product IDs"
-                    },
-                    "periods": {
-                        "type": "integer",
-                        "default": 30,
-                        "description": "Number of periods to forecast"
-                    },
-                    "period_type": {
-                        "type": "string",
-                        "enum": ["day", "week", "month"],
-                        "default": "day"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_FORECAST_SUMMARY
         ),
 
         # Lead Time Tool
         Tool(
             name="get_lead_time",
             description="Get supplier lead time for products. Lead time is the number of days from order to delivery. Returns product name, code, supplier name, and lead time in days.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_name": {
-                        "type": "string",
-                        "description": "Product name to search for (partial match)"
-                    },
-                    "category_name": {
-                        "type": "string",
-                        "description": "Category name to filter products (e.g., 'Durasafe', 'Laminex')"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_LEAD_TIME
         ),
 
         # Future Stock Alert Tool
         Tool(
             name="get_future_stock_alert",
             description="Get low stock alerts for a future date considering lead time. Shows which products will have stock below threshold on the target date, and when to place orders to avoid stockouts. Useful for planning ahead.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "target_date": {
-                        "type": "string",
-                        "description": "Target date to check stock levels (format: YYYY-MM-DD, e.g., '2025-07-26')"
-                    },
-                    "threshold": {
-                        "type": "number",
-                        "default": 50,
-                        "description": "Stock threshold - products with projected stock at or below this will be flagged as low"
-                    },
-                    "category_name": {
-                        "type": "string",
-                        "description": "Category name to filter products (e.g., 'Durasafe', 'Laminex')"
-                    },
-                    "product_name": {
-                        "type": "string",
-                        "description": "Product name to search for (partial match)"
-                    },
-                    "exclude_keywords": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "default": ["TBA", "Non Stock", "DISC"],
-                        "description": "Keywords to exclude from product names (default: TBA, Non Stock, DISC). Pass empty array [] to include all products."
-                    }
-                },
-                "required": ["target_date"]
-            }
+            inputSchema=_SCHEMA_GET_FUTURE_STOCK_ALERT
         ),
 
         # Analysis Tools
         Tool(
             name="analyze_abc_xyz",
             description="Perform ABC/XYZ inventory classification. ABC classifies by value (A=high, B=medium, C=low). XYZ classifies by demand variability (X=stable, Y=variable, Z=unpredictable).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of product IDs"
-                    },
-                    "category_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of category IDs"
-                    },
-                    "analysis_period_days": {
-                        "type": "integer",
-                        "default": 365,
-                        "description": "Historical period for analysis"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_ANALYZE_ABC_XYZ
         ),
         Tool(
             name="get_abc_xyz_summary",
             description="Get summary of ABC/XYZ analysis including distribution matrices and value breakdowns.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of product IDs"
-                    },
-                    "category_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of category IDs"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_ABC_XYZ_SUMMARY
         ),
         Tool(
             name="analyze_turnover",
             description="Analyze inventory turnover ratios. Classifies items as fast-moving (>12/year), normal (4-12/year), slow-moving (1-4/year), or dead stock (<1/year).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of product IDs"
-                    },
-                    "category_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of category IDs"
-                    },
-                    "analysis_period_days": {
-                        "type": "integer",
-                        "default": 365,
-                        "description": "Period for COGS calculation"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_ANALYZE_TURNOVER
         ),
         Tool(
             name="analyze_aging",
             description="Analyze inventory aging by tracking how long items have been in stock at WH/Stock location. Categorizes into buckets: 0-30, 31-60, 61-90, 91-180, 181-365, and over 1 year.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of product IDs"
-                    },
-                    "category_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of category IDs"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_ANALYZE_AGING
         ),
         Tool(
             name="get_turnover_summary",
             description="Get summary of turnover analysis including average turnover ratio, days of inventory, and category distribution.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of product IDs"
-                    },
-                    "category_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of category IDs"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_TURNOVER_SUMMARY
         ),
         Tool(
             name="get_aging_summary",
             description="Get summary of aging analysis including total inventory value, average age, aging bucket breakdown, and obsolescence risk counts.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of product IDs"
-                    },
-                    "category_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of category IDs"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_AGING_SUMMARY
         ),
         Tool(
             name="get_slow_moving_items",
             description="Get list of slow-moving and dead stock items that may need attention (discounts, liquidation, or discontinuation).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "min_value": {
-                        "type": "number",
-                        "default": 0,
-                        "description": "Minimum stock value to include"
-                    },
-                    "category_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of category IDs"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_SLOW_MOVING_ITEMS
         ),
         Tool(
             name="get_high_risk_aging_items",
             description="Get items with high obsolescence risk based on aging analysis.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "min_value": {
-                        "type": "number",
-                        "default": 0,
-                        "description": "Minimum stock value to include"
-                    },
-                    "category_ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Optional list of category IDs"
-                    }
-                }
-            }
+            inputSchema=_SCHEMA_GET_HIGH_RISK_AGING_ITEMS
         ),
     ]
+
+
+def _add_no_cache(tools: list[Tool]) -> list[Tool]:
+    """Add the no_cache property to every tool's (already copied) input schema."""
+    for tool in tools:
+        tool.inputSchema["properties"] = {**tool.inputSchema.get("properties", {}), "no_cache": _NO_CACHE_PROP}
+    return tools
+
+
+# Tool definitions never change at runtime; build the Tool models once
+_TOOL_DEFINITIONS: tuple[Tool, ...] = tuple(_add_no_cache(_build_tool_definitions()))
+
+
+def get_tool_definitions() -> list[Tool]:
+    """Return all tool definitions."""
+    return list(_TOOL_DEFINITIONS)
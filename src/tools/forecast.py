@@ -2,193 +2,269 @@
 Forecast tools - get_stock_forecast, forecast_demand, get_forecast_summary
 """
 
-import json
+import os
+from bisect import bisect_right
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any
-from dataclasses import asdict
+
+import numpy as np
 from mcp.types import TextContent, CallToolResult
 
 from ..odoo_client import OdooClient
 from ..config import DEFAULT_LOCATION_ID
-from ..analysis import DemandForecaster
-from ..analysis.forecasting import ForecastMethod
-
-
-def serialize_results(results: list) -> list[dict]:
-    """Convert dataclass results to serializable dictionaries."""
-    serialized = []
-    for r in results:
-        if hasattr(r, "__dataclass_fields__"):
-            d = asdict(r)
-            # Convert Enum values to strings
-            for key, value in d.items():
-                if hasattr(value, "value"):
-                    d[key] = value.value
-            serialized.append(d)
-        else:
-            serialized.append(r)
-    return serialized
+from ..workers import get_process_pool
+from .. import analysis as analyzers
+from ..domain import D, PENDING_STOCK_MOVE, STORABLE_PRODUCT, name_or_code
+from ._json import dumps
+from ._categories import category_domain
+from ._analysis_cache import run_analysis
+
+
+# Forecast method name -> enum member, filled on first use so importing this
+# module does not load the forecasting stack
+_METHOD_CACHE: dict[str, Any] = {}
+
+_ONE_WEEK = timedelta(weeks=1)
+
+# Sum forecast moves in Odoo with read_group; 0 fetches raw moves instead
+_GROUPED_FORECAST = os.environ.get("ODOO_GROUPED_FORECAST", "1").lower() not in ("0", "false", "no")
+# Products per concurrent stock.move query when not grouping
+_FALLBACK_CHUNK_SIZE = 25
+
+
+def _forecast_method(name: str) -> Any:
+    """Return the ForecastMethod called name, or raise ValueError."""
+    if not _METHOD_CACHE:
+        from ..analysis.forecasting import ForecastMethod
+        _METHOD_CACHE.update((m.value, m) for m in ForecastMethod)
+    method = _METHOD_CACHE.get(name)
+    if method is None:
+        raise ValueError(
+            f"Unknown forecast method '{name}'. Valid methods: {', '.join(_METHOD_CACHE)}"
+        )
+    return method
+
+
+def _group_day(group: dict) -> str:
+    """Return the 'YYYY-MM-DD' day of a read_group row grouped by 'date:day'."""
+    # Odoo 16+ reports the bucket bounds directly; older versions only
+    # expose them as the leading date leaf of the group's domain
+    if '__range' in group:
+        return group['__range']['date:day']['from'][:10]
+    for leaf in group['__domain']:
+        if isinstance(leaf, (list, tuple)) and leaf[0] == 'date' and leaf[1] == '>=':
+            return leaf[2][:10]
+    raise ValueError("read_group row has no date:day bounds")
+
+
+def _pending_moves_by_day(
+    client: OdooClient, product_ids: list[int], date_from: str, date_to: str
+) -> list[tuple[dict, str]]:
+    """
+    Pending stock-location moves of products between two datetimes.
+
+    Returns (row, 'YYYY-MM-DD') pairs; each row has product_id, location_id,
+    location_dest_id and product_uom_qty. Normally Odoo sums the quantities
+    per product, locations and day in one read_group. With
+    ODOO_GROUPED_FORECAST=0 (for servers where that query is slow) the raw
+    moves are fetched instead, in product chunks queried concurrently.
+    """
+    period = D.term('date', '>=', date_from) & D.term('date', '<=', date_to)
+    if _GROUPED_FORECAST:
+        groups = client.read_group(
+            'stock.move',
+            list(D.in_('product_id', product_ids) & PENDING_STOCK_MOVE & period),
+            ['product_uom_qty:sum'],
+            ['product_id', 'location_id', 'location_dest_id', 'date:day']
+        )
+        return [(group, _group_day(group)) for group in groups]
+
+    chunks = [
+        product_ids[i:i + _FALLBACK_CHUNK_SIZE]
+        for i in range(0, len(product_ids), _FALLBACK_CHUNK_SIZE)
+    ]
+    results = client.gather(*(
+        partial(
+            client.search_read,
+            'stock.move',
+            list(D.in_('product_id', chunk) & PENDING_STOCK_MOVE & period),
+            ['product_id', 'location_id', 'location_dest_id', 'date', 'product_uom_qty']
+        )
+        for chunk in chunks
+    ))
+    return [(move, move['date'][:10]) for moves in results for move in moves]
 
 
 def handle_get_stock_forecast(client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
     """Get pending stock forecast for products."""
     product_name = arguments.get("product_name")
     category_name = arguments.get("category_name")
+    category_ids = arguments.get("category_ids")
     weeks = min(max(arguments.get("weeks", 4), 1), 12)  # 1-12 weeks
 
     # Get products
-    product_domain = [('type', '=', 'product')]
+    product_domain = STORABLE_PRODUCT
     if product_name:
-        product_domain.append('|')
-        product_domain.append(('name', 'ilike', product_name))
-        product_domain.append(('default_code', 'ilike', product_name))
-    if category_name:
-        categories = client.search_read(
-            'product.category',
-            [('complete_name', 'ilike', category_name)],
-            ['id'],
-            limit=10
-        )
-        if categories:
-            cat_ids = [c['id'] for c in categories]
-            product_domain.append(('categ_id', 'child_of', cat_ids))
+        product_domain &= name_or_code(product_name)
+    if category_ids:
+        # Known ids need no category lookup
+        product_domain &= D.child_of('categ_id', category_ids)
+    else:
+        product_domain &= category_domain(client, category_name)
 
     products = client.search_read(
         'product.product',
-        product_domain,
+        list(product_domain),
         ['id', 'name', 'default_code', 'qty_available'],
-        limit=100
+        limit=100,
+        # On-hand in the same location the moves below are counted against
+        context={'location': DEFAULT_LOCATION_ID}
     )
 
     if not products:
         return CallToolResult(
             content=[TextContent(
                 type="text",
-                text=json.dumps({"error": "No products found matching criteria"}, indent=2)
+                text=dumps({"error": "No products found matching criteria"})
             )]
         )
 
     product_ids = [p['id'] for p in products]
-    products_dict = {p['id']: p for p in products}
 
+    # Week w (0-based) covers days [week_days[w], week_days[w + 1]); the
+    # horizon's last day belongs to the final week
     today = datetime.now().date()
+    week_days = [today + i * _ONE_WEEK for i in range(weeks + 1)]
+    week_starts = [day.strftime('%Y-%m-%d') for day in week_days]
 
     # Initialize results
     results = {
-        'forecast_period': f"{today} to {today + timedelta(weeks=weeks)}",
+        'forecast_period': f"{today} to {week_days[-1]}",
         'weeks': weeks,
         'products': []
     }
 
-    for prod_id, prod in products_dict.items():
-        product_forecast = {
-            'product_id': prod_id,
+    moves = _pending_moves_by_day(
+        client, product_ids, f"{week_starts[0]} 00:00:00", f"{week_starts[-1]} 23:59:59"
+    )
+
+    # Quantities per (product, week); running stock is the cumulative net
+    # flow on top of today's on-hand quantity
+    product_index = {pid: i for i, pid in enumerate(product_ids)}
+    in_rows, in_weeks, in_qty = [], [], []
+    out_rows, out_weeks, out_qty = [], [], []
+    for move, day in moves:
+        row = product_index[move['product_id'][0]]
+        week_index = min(bisect_right(week_starts, day) - 1, weeks - 1)
+        qty = move['product_uom_qty']
+        if move['location_dest_id'] and move['location_dest_id'][0] == DEFAULT_LOCATION_ID:
+            in_rows.append(row)
+            in_weeks.append(week_index)
+            in_qty.append(qty)
+        if move['location_id'] and move['location_id'][0] == DEFAULT_LOCATION_ID:
+            out_rows.append(row)
+            out_weeks.append(week_index)
+            out_qty.append(qty)
+
+    incoming = np.zeros((len(product_ids), weeks))
+    outgoing = np.zeros((len(product_ids), weeks))
+    np.add.at(incoming, (in_rows, in_weeks), in_qty)
+    np.add.at(outgoing, (out_rows, out_weeks), out_qty)
+
+    current_on_hand = [p.get('qty_available', 0) for p in products]
+    on_hand = np.array(current_on_hand, dtype=np.float64)
+    ending_stock = on_hand[:, None] + np.cumsum(incoming - outgoing, axis=1)
+    total_incoming = incoming.sum(axis=1)
+    total_outgoing = outgoing.sum(axis=1)
+
+    # Week labels are the same for every product; format them once
+    week_periods = [
+        f"{week_days[i].strftime('%d %b')} - {week_days[i + 1].strftime('%d %b')}"
+        for i in range(weeks)
+    ]
+
+    incoming_rows = incoming.tolist()
+    outgoing_rows = outgoing.tolist()
+    ending_rows = ending_stock.tolist()
+    for i, prod in enumerate(products):
+        product_incoming = incoming_rows[i]
+        product_outgoing = outgoing_rows[i]
+        product_ending = ending_rows[i]
+        results['products'].append({
+            'product_id': prod['id'],
             'name': prod['name'],
             'code': prod.get('default_code') or 'N/A',
-            'current_on_hand': prod.get('qty_available', 0),
-            'weekly_forecast': []
-        }
-
-        running_stock = prod.get('qty_available', 0)
-
-        for week in range(1, weeks + 1):
-            week_start = today + timedelta(days=(week-1)*7)
-            week_end = today + timedelta(days=week*7)
-
-            # Get incoming moves for this week
-            incoming = client.search_read(
-                'stock.move',
-                [
-                    ('product_id', '=', prod_id),
-                    ('state', 'in', ['assigned', 'confirmed', 'waiting']),
-                    ('location_dest_id', '=', DEFAULT_LOCATION_ID),
-                    ('date', '>=', week_start.strftime('%Y-%m-%d 00:00:00')),
-                    ('date', '<=', week_end.strftime('%Y-%m-%d 23:59:59'))
-                ],
-                ['product_uom_qty']
-            )
-
-            # Get outgoing moves for this week
-            outgoing = client.search_read(
-                'stock.move',
-                [
-                    ('product_id', '=', prod_id),
-                    ('state', 'in', ['assigned', 'confirmed', 'waiting']),
-                    ('location_id', '=', DEFAULT_LOCATION_ID),
-                    ('date', '>=', week_start.strftime('%Y-%m-%d 00:00:00')),
-                    ('date', '<=', week_end.strftime('%Y-%m-%d 23:59:59'))
-                ],
-                ['product_uom_qty']
-            )
-
-            week_incoming = sum(m['product_uom_qty'] for m in incoming)
-            week_outgoing = sum(m['product_uom_qty'] for m in outgoing)
-            running_stock = running_stock + week_incoming - week_outgoing
-
-            product_forecast['weekly_forecast'].append({
-                'week': week,
-                'period': f"{week_start.strftime('%d %b')} - {week_end.strftime('%d %b')}",
-                'incoming': week_incoming,
-                'outgoing': week_outgoing,
-                'ending_stock': running_stock
-            })
-
-        product_forecast['final_stock'] = running_stock
-        product_forecast['total_incoming'] = sum(w['incoming'] for w in product_forecast['weekly_forecast'])
-        product_forecast['total_outgoing'] = sum(w['outgoing'] for w in product_forecast['weekly_forecast'])
-
-        results['products'].append(product_forecast)
+            'current_on_hand': current_on_hand[i],
+            'weekly_forecast': [
+                {
+                    'week': w + 1,
+                    'period': week_periods[w],
+                    'incoming': product_incoming[w],
+                    'outgoing': product_outgoing[w],
+                    'ending_stock': product_ending[w]
+                }
+                for w in range(weeks)
+            ],
+            'final_stock': product_ending[-1],
+            'total_incoming': float(total_incoming[i]),
+            'total_outgoing': float(total_outgoing[i])
+        })
 
     # Add summary
     results['summary'] = {
-        'total_products': len(results['products']),
-        'total_current_stock': sum(p['current_on_hand'] for p in results['products']),
-        'total_final_stock': sum(p['final_stock'] for p in results['products']),
-        'total_incoming': sum(p['total_incoming'] for p in results['products']),
-        'total_outgoing': sum(p['total_outgoing'] for p in results['products'])
+        'total_products': len(products),
+        'total_current_stock': float(on_hand.sum()),
+        'total_final_stock': float(ending_stock[:, -1].sum()),
+        'total_incoming': float(total_incoming.sum()),
+        'total_outgoing': float(total_outgoing.sum())
     }
 
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps(results, indent=2)
+            text=dumps(results)
         )]
     )
 
 
 def handle_forecast_demand(client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
     """Forecast future demand for products using time series analysis."""
-    forecaster = DemandForecaster(client)
-    method_str = arguments.get("method", "auto")
-    method = ForecastMethod(method_str)
-
-    results = forecaster.forecast_demand(
+    forecaster = analyzers.DemandForecaster(client)
+    results = run_analysis(
+        forecaster, "forecast_demand",
+        executor=get_process_pool(),
         product_ids=arguments.get("product_ids"),
         periods=arguments.get("periods", 30),
         period_type=arguments.get("period_type", "day"),
-        method=method,
+        method=_forecast_method(arguments.get("method", "auto")),
         historical_days=arguments.get("historical_days", 365)
     )
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps(serialize_results(results), indent=2)
+            text=dumps(results)
         )]
     )
 
 
 def handle_get_forecast_summary(client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
     """Get summary of demand forecasts."""
-    forecaster = DemandForecaster(client)
-    results = forecaster.forecast_demand(
+    forecaster = analyzers.DemandForecaster(client)
+    # Same call as forecast_demand with its defaults, so the two share a result
+    results = run_analysis(
+        forecaster, "forecast_demand",
+        executor=get_process_pool(),
         product_ids=arguments.get("product_ids"),
         periods=arguments.get("periods", 30),
-        period_type=arguments.get("period_type", "day")
+        period_type=arguments.get("period_type", "day"),
+        method=_forecast_method("auto"),
+        historical_days=365
     )
     summary = forecaster.get_forecast_summary(results)
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps(summary, indent=2)
+            text=dumps(summary)
         )]
     )
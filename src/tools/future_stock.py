@@ -2,13 +2,21 @@
 Future stock alert tools - get_future_stock_alert
 """
 
-import json
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
+from functools import partial
+from operator import itemgetter
 from typing import Any
+
+import numpy as np
 from mcp.types import TextContent, CallToolResult
 
 from ..odoo_client import OdooClient
 from ..config import DEFAULT_LOCATION_ID
+from ..domain import D, PENDING_STOCK_MOVE, STORABLE_PRODUCT, name_or_code
+from ._json import dumps
+from ._categories import category_domain
+from ._suppliers import top_suppliers
 
 
 def handle_get_future_stock_alert(client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
@@ -31,7 +39,7 @@ def handle_get_future_stock_alert(client: OdooClient, arguments: dict[str, Any])
         return CallToolResult(
             content=[TextContent(
                 type="text",
-                text=json.dumps({"error": "Invalid date format. Use YYYY-MM-DD (e.g., '2025-07-26')"}, indent=2)
+                text=dumps({"error": "Invalid date format. Use YYYY-MM-DD (e.g., '2025-07-26')"})
             )]
         )
 
@@ -40,36 +48,26 @@ def handle_get_future_stock_alert(client: OdooClient, arguments: dict[str, Any])
         return CallToolResult(
             content=[TextContent(
                 type="text",
-                text=json.dumps({"error": "Target date must be in the future"}, indent=2)
+                text=dumps({"error": "Target date must be in the future"})
             )]
         )
 
     days_until_target = (target_date - today).days
 
     # Build domain for products
-    product_domain = [('type', '=', 'product')]
-
     if product_name:
-        product_domain.insert(0, '|')
-        product_domain.insert(1, ('name', 'ilike', product_name))
-        product_domain.insert(2, ('default_code', 'ilike', product_name))
-
-    if category_name:
-        categories = client.search_read(
-            'product.category',
-            [('complete_name', 'ilike', category_name)],
-            ['id'],
-            limit=10
-        )
-        if categories:
-            cat_ids = [c['id'] for c in categories]
-            product_domain.append(('categ_id', 'child_of', cat_ids))
+        product_domain = name_or_code(product_name) & STORABLE_PRODUCT
+    else:
+        product_domain = STORABLE_PRODUCT
+
+    product_domain &= category_domain(client, category_name)
 
-    # Get products with stored fields
+    # Get products, computed fields included
     products_basic = client.search_read(
         'product.product',
-        product_domain,
-        ['id', 'name', 'default_code', 'product_tmpl_id', 'qty_available', 'minimum'],
+        list(product_domain),
+        ['id', 'name', 'default_code', 'product_tmpl_id', 'qty_available', 'minimum',
+         'pending_forecast', 'require'],
         limit=500
     )
 
@@ -77,7 +75,7 @@ def handle_get_future_stock_alert(client: OdooClient, arguments: dict[str, Any])
         return CallToolResult(
             content=[TextContent(
                 type="text",
-                text=json.dumps({"error": "No products found matching criteria"}, indent=2)
+                text=dumps({"error": "No products found matching criteria"})
             )]
         )
 
@@ -92,89 +90,61 @@ def handle_get_future_stock_alert(client: OdooClient, arguments: dict[str, Any])
         return CallToolResult(
             content=[TextContent(
                 type="text",
-                text=json.dumps({"error": "No products found after applying exclusion filters"}, indent=2)
+                text=dumps({"error": "No products found after applying exclusion filters"})
             )]
         )
 
-    # Get computed fields (pending_forecast, require)
     product_ids = [p['id'] for p in products_basic]
-    computed_data = client.read(
-        'product.product',
-        product_ids,
-        ['id', 'pending_forecast', 'require']
-    )
-    products_computed = {p['id']: p for p in computed_data}
-
-    # Get product template IDs for lead time lookup
-    product_tmpl_ids = [p['product_tmpl_id'][0] for p in products_basic if p.get('product_tmpl_id')]
-    product_by_tmpl = {}
-    for p in products_basic:
-        if p.get('product_tmpl_id'):
-            product_by_tmpl[p['product_tmpl_id'][0]] = p
-
-    # Get supplier info for lead times (top supplier only)
-    supplier_infos = client.search_read(
-        'product.supplierinfo',
-        [('product_tmpl_id', 'in', product_tmpl_ids)],
-        ['product_tmpl_id', 'partner_id', 'delay', 'sequence'],
-        order='product_tmpl_id, sequence, id'
-    )
 
-    # Group by product template and take only the first (top) supplier
-    supplier_by_tmpl = {}
-    for si in supplier_infos:
-        tmpl_id = si['product_tmpl_id'][0]
-        if tmpl_id not in supplier_by_tmpl:
-            supplier_by_tmpl[tmpl_id] = si
+    # Unique product template IDs for lead time lookup (variants share one)
+    product_tmpl_ids = sorted({p['product_tmpl_id'][0] for p in products_basic if p.get('product_tmpl_id')})
 
-    # Get scheduled moves (incoming and outgoing) up to target date
+    # Scheduled moves (incoming and outgoing) up to target date
     target_date_end = target_date.strftime('%Y-%m-%d 23:59:59')
     today_start = today.strftime('%Y-%m-%d 00:00:00')
-
-    # Incoming moves to WH/Stock
-    incoming_moves = client.search_read(
-        'stock.move',
-        [
-            ('product_id', 'in', product_ids),
-            ('state', 'in', ['assigned', 'confirmed', 'waiting']),
-            ('location_dest_id', '=', DEFAULT_LOCATION_ID),
-            ('date', '>=', today_start),
-            ('date', '<=', target_date_end)
-        ],
-        ['product_id', 'product_uom_qty', 'date']
-    )
-
-    # Outgoing moves from WH/Stock
-    outgoing_moves = client.search_read(
-        'stock.move',
-        [
-            ('product_id', 'in', product_ids),
-            ('state', 'in', ['assigned', 'confirmed', 'waiting']),
-            ('location_id', '=', DEFAULT_LOCATION_ID),
-            ('date', '>=', today_start),
-            ('date', '<=', target_date_end)
-        ],
-        ['product_id', 'product_uom_qty', 'date']
+    horizon = D.term('date', '>=', today_start) & D.term('date', '<=', target_date_end)
+
+    # The remaining lookups only depend on the products; run them concurrently:
+    # the top supplier for lead times, and move quantities into or out of
+    # WH/Stock summed by Odoo per product and locations (split by direction below)
+    supplier_by_tmpl, move_groups = client.gather(
+        partial(top_suppliers, client, product_tmpl_ids, ['partner_id', 'delay']),
+        partial(
+            client.read_group,
+            'stock.move',
+            list(D.in_('product_id', product_ids) & PENDING_STOCK_MOVE & horizon),
+            ['product_uom_qty:sum'],
+            ['product_id', 'location_id', 'location_dest_id']
+        ),
     )
 
-    # Aggregate moves by product
-    incoming_by_product = {}
-    for move in incoming_moves:
-        pid = move['product_id'][0]
-        incoming_by_product[pid] = incoming_by_product.get(pid, 0) + move['product_uom_qty']
-
-    outgoing_by_product = {}
-    for move in outgoing_moves:
-        pid = move['product_id'][0]
-        outgoing_by_product[pid] = outgoing_by_product.get(pid, 0) + move['product_uom_qty']
+    # Split the move groups by direction; a move within WH/Stock counts both ways
+    incoming_by_product = defaultdict(float)
+    outgoing_by_product = defaultdict(float)
+    for group in move_groups:
+        pid = group['product_id'][0]
+        qty = group['product_uom_qty']
+        dest, source = group['location_dest_id'], group['location_id']
+        if dest and dest[0] == DEFAULT_LOCATION_ID:
+            incoming_by_product[pid] += qty
+        if source and source[0] == DEFAULT_LOCATION_ID:
+            outgoing_by_product[pid] += qty
+
+    # Project every product's stock at once and only build alerts for those
+    # at or below the threshold
+    count = len(products_basic)
+    on_hand = np.fromiter((p.get('qty_available', 0) for p in products_basic), dtype=np.float64, count=count)
+    incoming_qty = np.fromiter((incoming_by_product.get(p['id'], 0) for p in products_basic), dtype=np.float64, count=count)
+    outgoing_qty = np.fromiter((outgoing_by_product.get(p['id'], 0) for p in products_basic), dtype=np.float64, count=count)
+    below_threshold = np.flatnonzero(on_hand + incoming_qty - outgoing_qty <= threshold)
 
     # Build results
     low_stock_alerts = []
 
-    for prod in products_basic:
+    for index in below_threshold:
+        prod = products_basic[index]
         prod_id = prod['id']
         tmpl_id = prod.get('product_tmpl_id', [None])[0]
-        computed = products_computed.get(prod_id, {})
         supplier = supplier_by_tmpl.get(tmpl_id, {}) if tmpl_id else {}
 
         current_stock = prod.get('qty_available', 0)
@@ -187,60 +157,58 @@ def handle_get_future_stock_alert(client: OdooClient, arguments: dict[str, Any])
         # Get lead time and minimum
         lead_time_days = supplier.get('delay', 0) if supplier else 0
         minimum = prod.get('minimum', 0)
-        pending_forecast = computed.get('pending_forecast', 0)
-        require = computed.get('require', 0)
+        pending_forecast = prod.get('pending_forecast', 0)
         supplier_name = supplier.get('partner_id', [None, 'No supplier'])[1] if supplier else 'No supplier'
 
-        # Check if projected stock is below threshold
-        if projected_stock <= threshold:
-            # Calculate order-by date
-            if lead_time_days > 0:
-                order_by_date = target_date - timedelta(days=lead_time_days)
-                order_by_date_str = order_by_date.strftime('%Y-%m-%d')
-
-                # Check if it's still possible to order in time
-                if order_by_date < today:
-                    order_status = "TOO LATE - Lead time exceeded"
-                    days_late = (today - order_by_date).days
-                    order_recommendation = f"Should have ordered {days_late} days ago"
-                elif order_by_date == today:
-                    order_status = "ORDER TODAY"
-                    order_recommendation = "Place order immediately to receive by target date"
-                else:
-                    days_until_order = (order_by_date - today).days
-                    order_status = "OK"
-                    order_recommendation = f"Place order within {days_until_order} days"
+        # Calculate order-by date
+        if lead_time_days > 0:
+            order_by_date = target_date - timedelta(days=lead_time_days)
+            order_by_date_str = order_by_date.strftime('%Y-%m-%d')
+
+            # Check if it's still possible to order in time
+            if order_by_date < today:
+                order_status = "TOO LATE - Lead time exceeded"
+                days_late = (today - order_by_date).days
+                order_recommendation = f"Should have ordered {days_late} days ago"
+            elif order_by_date == today:
+                order_status = "ORDER TODAY"
+                order_recommendation = "Place order immediately to receive by target date"
             else:
-                order_by_date_str = "N/A"
-                order_status = "NO LEAD TIME"
-                order_recommendation = "No supplier lead time configured"
-
-            # Calculate suggested order quantity
-            shortage = threshold - projected_stock
-            suggested_qty = max(shortage, minimum - projected_stock) if minimum > projected_stock else shortage
-
-            low_stock_alerts.append({
-                'product_id': prod_id,
-                'name': prod['name'],
-                'code': prod.get('default_code') or 'N/A',
-                'current_stock': current_stock,
-                'incoming_by_target': incoming,
-                'outgoing_by_target': outgoing,
-                'projected_stock': round(projected_stock, 2),
-                'minimum': minimum,
-                'pending_forecast': pending_forecast,
-                'threshold': threshold,
-                'shortage': round(max(0, threshold - projected_stock), 2),
-                'supplier': supplier_name,
-                'lead_time_days': lead_time_days,
-                'order_by_date': order_by_date_str,
-                'order_status': order_status,
-                'order_recommendation': order_recommendation,
-                'suggested_order_qty': round(max(0, suggested_qty), 2)
-            })
+                days_until_order = (order_by_date - today).days
+                order_status = "OK"
+                order_recommendation = f"Place order within {days_until_order} days"
+        else:
+            order_by_date_str = "N/A"
+            order_status = "NO LEAD TIME"
+            order_recommendation = "No supplier lead time configured"
+
+        # Calculate suggested order quantity
+        shortage = threshold - projected_stock
+        suggested_qty = max(shortage, minimum - projected_stock) if minimum > projected_stock else shortage
+
+        low_stock_alerts.append({
+            'product_id': prod_id,
+            'name': prod['name'],
+            'code': prod.get('default_code') or 'N/A',
+            'current_stock': current_stock,
+            'incoming_by_target': incoming,
+            'outgoing_by_target': outgoing,
+            'projected_stock': round(projected_stock, 2),
+            'minimum': minimum,
+            'pending_forecast': pending_forecast,
+            'threshold': threshold,
+            'shortage': round(max(0, threshold - projected_stock), 2),
+            'supplier': supplier_name,
+            'lead_time_days': lead_time_days,
+            'order_by_date': order_by_date_str,
+            'order_status': order_status,
+            'order_recommendation': order_recommendation,
+            'suggested_order_qty': round(max(0, suggested_qty), 2)
+        })
 
     # Sort by projected stock (lowest first - most critical)
-    low_stock_alerts.sort(key=lambda x: x['projected_stock'])
+    low_stock_alerts.sort(key=itemgetter('projected_stock'))
+    status_counts = Counter(a['order_status'] for a in low_stock_alerts)
 
     summary = {
         'target_date': target_date_str,
@@ -248,17 +216,17 @@ def handle_get_future_stock_alert(client: OdooClient, arguments: dict[str, Any])
         'threshold': threshold,
         'total_products_checked': len(products_basic),
         'low_stock_count': len(low_stock_alerts),
-        'critical_count': sum(1 for a in low_stock_alerts if a['order_status'] == 'TOO LATE - Lead time exceeded'),
-        'order_today_count': sum(1 for a in low_stock_alerts if a['order_status'] == 'ORDER TODAY'),
-        'ok_count': sum(1 for a in low_stock_alerts if a['order_status'] == 'OK')
+        'critical_count': status_counts['TOO LATE - Lead time exceeded'],
+        'order_today_count': status_counts['ORDER TODAY'],
+        'ok_count': status_counts['OK']
     }
 
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 'summary': summary,
                 'low_stock_alerts': low_stock_alerts
-            }, indent=2)
+            })
         )]
     )
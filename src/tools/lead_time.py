@@ -2,11 +2,15 @@
 Lead time tools - get_lead_time
 """
 
-import json
+from operator import itemgetter
 from typing import Any
 from mcp.types import TextContent, CallToolResult
 
 from ..odoo_client import OdooClient
+from ..domain import STORABLE_PRODUCT, name_or_code
+from ._json import dumps
+from ._categories import category_domain
+from ._suppliers import top_suppliers
 
 
 def handle_get_lead_time(client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
@@ -15,28 +19,17 @@ def handle_get_lead_time(client: OdooClient, arguments: dict[str, Any]) -> CallT
     category_name = arguments.get("category_name")
 
     # Build domain for products
-    product_domain = [('type', '=', 'product')]
-
     if product_name:
-        product_domain.insert(0, '|')
-        product_domain.insert(1, ('name', 'ilike', product_name))
-        product_domain.insert(2, ('default_code', 'ilike', product_name))
+        product_domain = name_or_code(product_name) & STORABLE_PRODUCT
+    else:
+        product_domain = STORABLE_PRODUCT
 
-    if category_name:
-        categories = client.search_read(
-            'product.category',
-            [('complete_name', 'ilike', category_name)],
-            ['id'],
-            limit=10
-        )
-        if categories:
-            cat_ids = [c['id'] for c in categories]
-            product_domain.append(('categ_id', 'child_of', cat_ids))
+    product_domain &= category_domain(client, category_name)
 
     # Get products
     products = client.search_read(
         'product.product',
-        product_domain,
+        list(product_domain),
         ['id', 'name', 'default_code', 'product_tmpl_id'],
         limit=200
     )
@@ -45,28 +38,17 @@ def handle_get_lead_time(client: OdooClient, arguments: dict[str, Any]) -> CallT
         return CallToolResult(
             content=[TextContent(
                 type="text",
-                text=json.dumps({"error": "No products found matching criteria"}, indent=2)
+                text=dumps({"error": "No products found matching criteria"})
             )]
         )
 
-    # Get product template IDs (supplier info is linked to template)
-    product_tmpl_ids = [p['product_tmpl_id'][0] for p in products if p.get('product_tmpl_id')]
+    # Unique product template IDs (supplier info is linked to the template,
+    # which variants share)
+    product_tmpl_ids = sorted({p['product_tmpl_id'][0] for p in products if p.get('product_tmpl_id')})
     product_by_tmpl = {p['product_tmpl_id'][0]: p for p in products if p.get('product_tmpl_id')}
 
-    # Get supplier info for these products (ordered by sequence to get top supplier first)
-    supplier_infos = client.search_read(
-        'product.supplierinfo',
-        [('product_tmpl_id', 'in', product_tmpl_ids)],
-        ['product_tmpl_id', 'partner_id', 'delay', 'min_qty', 'price', 'sequence'],
-        order='product_tmpl_id, sequence, id'
-    )
-
-    # Group by product template and take only the first (top) supplier
-    supplier_by_tmpl = {}
-    for si in supplier_infos:
-        tmpl_id = si['product_tmpl_id'][0]
-        if tmpl_id not in supplier_by_tmpl:
-            supplier_by_tmpl[tmpl_id] = si
+    # Top supplier of each template (supplier info is linked to the template)
+    supplier_by_tmpl = top_suppliers(client, product_tmpl_ids, ['partner_id', 'delay', 'min_qty', 'price'])
 
     # Build results
     results = []
@@ -83,20 +65,35 @@ def handle_get_lead_time(client: OdooClient, arguments: dict[str, Any]) -> CallT
         })
 
     # Sort by lead time (highest first to show longest lead times)
-    results.sort(key=lambda x: x['lead_time_days'], reverse=True)
+    results.sort(key=itemgetter('lead_time_days'), reverse=True)
+
+    # Summary statistics in one pass over the results
+    with_supplier = 0
+    total_lead_time = 0
+    max_lead_time = 0
+    min_lead_time = None
+    for r in results:
+        lead_time = r['lead_time_days']
+        if r['supplier'] != 'No supplier':
+            with_supplier += 1
+        total_lead_time += lead_time
+        if lead_time > max_lead_time:
+            max_lead_time = lead_time
+        if lead_time > 0 and (min_lead_time is None or lead_time < min_lead_time):
+            min_lead_time = lead_time
 
     summary = {
         'total_products': len(results),
-        'products_with_supplier': sum(1 for r in results if r['supplier'] != 'No supplier'),
-        'products_without_supplier': sum(1 for r in results if r['supplier'] == 'No supplier'),
-        'avg_lead_time_days': round(sum(r['lead_time_days'] for r in results) / len(results), 1) if results else 0,
-        'max_lead_time_days': max((r['lead_time_days'] for r in results), default=0),
-        'min_lead_time_days': min((r['lead_time_days'] for r in results if r['lead_time_days'] > 0), default=0)
+        'products_with_supplier': with_supplier,
+        'products_without_supplier': len(results) - with_supplier,
+        'avg_lead_time_days': round(total_lead_time / len(results), 1) if results else 0,
+        'max_lead_time_days': max_lead_time,
+        'min_lead_time_days': min_lead_time if min_lead_time is not None else 0
     }
 
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps({'summary': summary, 'products': results}, indent=2)
+            text=dumps({'summary': summary, 'products': results})
         )]
     )
@@ -2,11 +2,54 @@
 Search tools - search_categories, search_products, get_products_by_category
 """
 
-import json
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Optional
 from mcp.types import TextContent, CallToolResult
 
 from ..odoo_client import OdooClient
+from ..domain import D, STORABLE_PRODUCT, name_or_code
+from ._json import dumps
+from ._categories import category_domain, find_categories
+from ._progress import report_progress
+
+
+# Page size for product fetches that report progress between pages
+PRODUCT_PAGE_SIZE = 500
+
+# Products returned by one get_products_by_category call
+DEFAULT_PRODUCT_LIMIT = 500
+MAX_PRODUCT_LIMIT = 5000
+
+# Optional get_products_by_category columns -> product.product field. All are
+# computed by Odoo per request, so each one requested adds server-side work:
+#   minimum                     - cheap (reads the product's reorder minimum)
+#   on_hand                     - moderate (sums stock quants)
+#   forecasted/incoming/outgoing - expensive (aggregate pending stock moves)
+#   pending_forecast/require    - expensive (custom computes over forecasts)
+CATEGORY_PRODUCT_FIELDS = {
+    'on_hand': 'qty_available',
+    'forecasted': 'virtual_available',
+    'incoming': 'incoming_qty',
+    'outgoing': 'outgoing_qty',
+    'minimum': 'minimum',
+    'pending_forecast': 'pending_forecast',
+    'require': 'require',
+}
+DEFAULT_CATEGORY_PRODUCT_FIELDS = ['on_hand', 'minimum', 'pending_forecast', 'require']
+
+
+@dataclass(slots=True)
+class ProductRow:
+    """One search_products result; encoded directly, without an intermediate dict."""
+    id: int
+    name: str
+    code: str
+    category: Optional[str]
+    on_hand: float
+    forecasted: float
+    minimum: float
+    pending_forecast: float
+    require: float
 
 
 def handle_search_categories(client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
@@ -29,7 +72,7 @@ def handle_search_categories(client: OdooClient, arguments: dict[str, Any]) -> C
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps(results, indent=2)
+            text=dumps(results)
         )]
     )
 
@@ -41,67 +84,45 @@ def handle_search_products(client: OdooClient, arguments: dict[str, Any]) -> Cal
     category_name = arguments.get("category_name")
 
     # Build domain based on search criteria
-    domain = [('type', '=', 'product')]
-
     if product_id:
         # Search by ID (exact match)
-        domain.append(('id', '=', product_id))
+        domain = STORABLE_PRODUCT & D.eq('id', product_id)
     elif search_name:
         # Search by name or code (partial match)
-        domain.insert(0, '|')
-        domain.insert(1, ('name', 'ilike', search_name))
-        domain.insert(2, ('default_code', 'ilike', search_name))
-
-    # If category name provided, find category first
-    if category_name:
-        categories = client.search_read(
-            'product.category',
-            [('complete_name', 'ilike', category_name)],
-            ['id'],
-            limit=10
-        )
-        if categories:
-            cat_ids = [c['id'] for c in categories]
-            domain.append(('categ_id', 'child_of', cat_ids))
+        domain = name_or_code(search_name) & STORABLE_PRODUCT
+    else:
+        domain = STORABLE_PRODUCT
 
-    # First get products with stored fields
-    products_basic = client.search_read(
+    # Restrict to the named category (and its subcategories)
+    domain &= category_domain(client, category_name)
+
+    # Computed fields come back in the same call as the stored ones
+    products = client.search_read(
         'product.product',
-        domain,
-        ['id', 'name', 'default_code', 'categ_id', 'qty_available', 'virtual_available', 'minimum'],
+        list(domain),
+        ['id', 'name', 'default_code', 'categ_id', 'qty_available', 'virtual_available', 'minimum',
+         'pending_forecast', 'require'],
         limit=50
     )
 
-    # Then use read() to get computed fields (pending_forecast, require)
-    product_ids = [p['id'] for p in products_basic]
-    products_computed = {}
-    if product_ids:
-        computed_data = client.read(
-            'product.product',
-            product_ids,
-            ['id', 'pending_forecast', 'require']
+    results = [
+        ProductRow(
+            id=prod['id'],
+            name=prod['name'],
+            code=prod.get('default_code') or 'N/A',
+            category=prod['categ_id'][1] if prod.get('categ_id') else None,
+            on_hand=prod.get('qty_available', 0),
+            forecasted=prod.get('virtual_available', 0),
+            minimum=prod.get('minimum', 0),
+            pending_forecast=prod.get('pending_forecast', 0),
+            require=prod.get('require', 0)
         )
-        products_computed = {p['id']: p for p in computed_data}
-
-    results = []
-    for prod in products_basic:
-        prod_id = prod['id']
-        computed = products_computed.get(prod_id, {})
-        results.append({
-            'id': prod_id,
-            'name': prod['name'],
-            'code': prod.get('default_code') or 'N/A',
-            'category': prod['categ_id'][1] if prod.get('categ_id') else None,
-            'on_hand': prod.get('qty_available', 0),
-            'forecasted': prod.get('virtual_available', 0),
-            'minimum': prod.get('minimum', 0),
-            'pending_forecast': computed.get('pending_forecast', 0),
-            'require': computed.get('require', 0)
-        })
+        for prod in products
+    ]
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps(results, indent=2)
+            text=dumps(results)
         )]
     )
 
@@ -110,20 +131,19 @@ def handle_get_products_by_category(client: OdooClient, arguments: dict[str, Any
     """Get all products in a category by category name."""
     category_name = arguments.get("category_name", "")
     include_subcategories = arguments.get("include_subcategories", True)
+    limit = max(1, min(arguments.get("limit", DEFAULT_PRODUCT_LIMIT), MAX_PRODUCT_LIMIT))
+    offset = max(0, arguments.get("offset", 0))
+    requested = set(arguments.get("fields", DEFAULT_CATEGORY_PRODUCT_FIELDS))
+    columns = [c for c in CATEGORY_PRODUCT_FIELDS if c in requested]
 
     # Find category by name
-    categories = client.search_read(
-        'product.category',
-        [('complete_name', 'ilike', category_name)],
-        ['id', 'name', 'complete_name'],
-        limit=10
-    )
+    categories = find_categories(client, category_name)
 
     if not categories:
         return CallToolResult(
             content=[TextContent(
                 type="text",
-                text=json.dumps({"error": f"No category found matching '{category_name}'"}, indent=2)
+                text=dumps({"error": f"No category found matching '{category_name}'"})
             )]
         )
 
@@ -133,28 +153,9 @@ def handle_get_products_by_category(client: OdooClient, arguments: dict[str, Any
 
     # Get products
     if include_subcategories:
-        product_domain = [('categ_id', 'child_of', cat_id), ('type', '=', 'product')]
+        product_domain = list(D.child_of('categ_id', cat_id) & STORABLE_PRODUCT)
     else:
-        product_domain = [('categ_id', '=', cat_id), ('type', '=', 'product')]
-
-    # First get product IDs with stored fields
-    products_basic = client.search_read(
-        'product.product',
-        product_domain,
-        ['id', 'name', 'default_code', 'categ_id', 'qty_available', 'virtual_available', 'incoming_qty', 'outgoing_qty', 'minimum'],
-        order='default_code'
-    )
-
-    # Then use read() to get computed fields (pending_forecast, require)
-    product_ids = [p['id'] for p in products_basic]
-    products_computed = {}
-    if product_ids:
-        computed_data = client.read(
-            'product.product',
-            product_ids,
-            ['id', 'pending_forecast', 'require']
-        )
-        products_computed = {p['id']: p for p in computed_data}
+        product_domain = list(D.eq('categ_id', cat_id) & STORABLE_PRODUCT)
 
     results = {
         'category': {
@@ -162,40 +163,61 @@ def handle_get_products_by_category(client: OdooClient, arguments: dict[str, Any
             'name': category['name'],
             'full_path': category.get('complete_name', category['name'])
         },
-        'product_count': len(products_basic),
+        'product_count': 0,
+        'offset': offset,
+        'has_more': False,
         'products': []
     }
 
-    for prod in products_basic:
-        prod_id = prod['id']
-        computed = products_computed.get(prod_id, {})
-        results['products'].append({
-            'id': prod_id,
-            'name': prod['name'],
-            'code': prod.get('default_code') or 'N/A',
-            'on_hand': prod.get('qty_available', 0),
-            'forecasted': prod.get('virtual_available', 0),
-            'incoming': prod.get('incoming_qty', 0),
-            'outgoing': prod.get('outgoing_qty', 0),
-            'minimum': prod.get('minimum', 0),
-            'pending_forecast': computed.get('pending_forecast', 0),
-            'require': computed.get('require', 0)
-        })
+    # Accumulate the summary totals while building the product rows
+    totals = dict.fromkeys(columns, 0)
+
+    # Large categories are fetched a page at a time, reporting progress to
+    # the client after each page instead of going quiet until the end
+    fetched = 0
+    while fetched < limit:
+        page_size = min(PRODUCT_PAGE_SIZE, limit - fetched)
+
+        # Product rows with the requested columns; one extra row tells
+        # whether more products follow this page
+        products = client.search_read(
+            'product.product',
+            product_domain,
+            ['id', 'name', 'default_code'] + [CATEGORY_PRODUCT_FIELDS[c] for c in columns],
+            limit=page_size + 1,
+            offset=offset + fetched,
+            order='default_code, id'
+        )
+        results['has_more'] = len(products) > page_size
+        products = products[:page_size]
+        if not products:
+            break
+
+        for prod in products:
+            row = {
+                'id': prod['id'],
+                'name': prod['name'],
+                'code': prod.get('default_code') or 'N/A',
+            }
+            for column in columns:
+                value = prod.get(CATEGORY_PRODUCT_FIELDS[column], 0)
+                row[column] = value
+                totals[column] += value
+            results['products'].append(row)
+
+        fetched += len(products)
+        report_progress(fetched, limit, f"Fetched {fetched} products")
+        if not results['has_more']:
+            break
+
+    results['product_count'] = len(results['products'])
 
     # Add summary
-    results['summary'] = {
-        'total_on_hand': sum(p['on_hand'] for p in results['products']),
-        'total_forecasted': sum(p['forecasted'] for p in results['products']),
-        'total_incoming': sum(p['incoming'] for p in results['products']),
-        'total_outgoing': sum(p['outgoing'] for p in results['products']),
-        'total_minimum': sum(p['minimum'] for p in results['products']),
-        'total_pending_forecast': sum(p['pending_forecast'] for p in results['products']),
-        'total_require': sum(p['require'] for p in results['products'])
-    }
+    results['summary'] = {f'total_{column}': totals[column] for column in columns}
 
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps(results, indent=2)
+            text=dumps(results)
         )]
     )
@@ -2,29 +2,24 @@
 Stock tools - get_stock_levels, get_reorder_alerts, get_stock_summary, get_reorder_rules
 """
 
-import json
 from typing import Any
-from dataclasses import asdict
+
+import numpy as np
 from mcp.types import TextContent, CallToolResult
 
 from ..odoo_client import OdooClient
-from ..analysis import StockLevelAnalyzer
+from .. import analysis as analyzers
+from ..domain import D, EMPTY, STORABLE_PRODUCT, name_or_code
+from ._json import dumps
+from ._categories import category_domain
 
 
-def serialize_results(results: list) -> list[dict]:
-    """Convert dataclass results to serializable dictionaries."""
-    serialized = []
-    for r in results:
-        if hasattr(r, "__dataclass_fields__"):
-            d = asdict(r)
-            # Convert Enum values to strings
-            for key, value in d.items():
-                if hasattr(value, "value"):
-                    d[key] = value.value
-            serialized.append(d)
-        else:
-            serialized.append(r)
-    return serialized
+# Optional get_reorder_rules columns -> product.product field. on_hand is
+# always read (it drives the shortage); forecasted aggregates pending stock
+# moves in Odoo and is only fetched on request.
+REORDER_PRODUCT_FIELDS = {
+    'forecasted': 'virtual_available',
+}
 
 
 def handle_get_reorder_rules(client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
@@ -32,108 +27,117 @@ def handle_get_reorder_rules(client: OdooClient, arguments: dict[str, Any]) -> C
     product_name = arguments.get("product_name")
     category_name = arguments.get("category_name")
     only_below_minimum = arguments.get("only_below_minimum", False)
+    include_forecasted = 'forecasted' in arguments.get("fields", [])
 
     # Build domain for orderpoints
-    orderpoint_domain = []
+    orderpoint_domain = EMPTY
 
     # Get product IDs if filtering by name or category
     product_ids = None
     if product_name or category_name:
-        product_domain = [('type', '=', 'product')]
+        product_domain = STORABLE_PRODUCT
         if product_name:
-            product_domain.append('|')
-            product_domain.append(('name', 'ilike', product_name))
-            product_domain.append(('default_code', 'ilike', product_name))
-        if category_name:
-            categories = client.search_read(
-                'product.category',
-                [('complete_name', 'ilike', category_name)],
-                ['id'],
-                limit=10
-            )
-            if categories:
-                cat_ids = [c['id'] for c in categories]
-                product_domain.append(('categ_id', 'child_of', cat_ids))
+            product_domain &= name_or_code(product_name)
+        product_domain &= category_domain(client, category_name)
 
         products = client.search_read(
             'product.product',
-            product_domain,
+            list(product_domain),
             ['id'],
             limit=200
         )
         product_ids = [p['id'] for p in products]
-        if product_ids:
-            orderpoint_domain.append(('product_id', 'in', product_ids))
+        if not product_ids:
+            # No product matches the filters, so no rule can either
+            return CallToolResult(
+                content=[TextContent(
+                    type="text",
+                    text=dumps({
+                        'summary': {'total_rules': 0, 'below_minimum_count': 0, 'total_shortage': 0.0},
+                        'reorder_rules': []
+                    })
+                )]
+            )
+        orderpoint_domain &= D.in_('product_id', product_ids)
+
+    # Get reorder rules (orderpoints) and current stock for their products
+    orderpoint_fields = ['product_id', 'product_min_qty', 'product_max_qty', 'qty_to_order', 'trigger', 'location_id']
+    product_fields = ['id', 'default_code', 'qty_available']
+    if include_forecasted:
+        product_fields.append(REORDER_PRODUCT_FIELDS['forecasted'])
 
-    # Get reorder rules (orderpoints)
     orderpoints = client.search_read(
         'stock.warehouse.orderpoint',
-        orderpoint_domain,
-        ['product_id', 'product_min_qty', 'product_max_qty', 'qty_to_order', 'trigger', 'location_id'],
+        list(orderpoint_domain),
+        orderpoint_fields,
         limit=200
     )
-
-    # Get current stock for these products
-    op_product_ids = list(set([op['product_id'][0] for op in orderpoints if op.get('product_id')]))
-
-    products_data = {}
-    if op_product_ids:
-        products = client.search_read(
-            'product.product',
-            [('id', 'in', op_product_ids)],
-            ['id', 'name', 'default_code', 'qty_available', 'virtual_available']
-        )
-        products_data = {p['id']: p for p in products}
+    # Read stock only for products that have a rule: on_hand (and forecasted)
+    # are computed per product, and a filtered product list can be much
+    # larger than the set of products with rules. Unique ids in ascending
+    # order so Odoo reads neighbouring records together.
+    # This stays a second round-trip: search_read cannot read through
+    # product_id, and the orderpoint's own qty_on_hand/qty_forecast only
+    # count its location, not the product-wide figures reported here.
+    op_product_ids = sorted({op['product_id'][0] for op in orderpoints if op.get('product_id')})
+    products = client.read('product.product', op_product_ids, product_fields) if op_product_ids else []
+
+    products_data = {p['id']: p for p in products}
+
+    # Struct-of-arrays view of the rules so the filter, shortage and sort
+    # run as vector operations; rows are only built for rules that are kept
+    orderpoints = [op for op in orderpoints if op.get('product_id')]
+    prods = [products_data.get(op['product_id'][0], {}) for op in orderpoints]
+    on_hand = np.array([p.get('qty_available', 0) for p in prods], dtype=float)
+    min_qty = np.array([op.get('product_min_qty', 0) for op in orderpoints], dtype=float)
+
+    below = on_hand < min_qty
+    shortage = np.maximum(0, min_qty - on_hand)
+
+    keep = np.flatnonzero(below) if only_below_minimum else np.arange(len(orderpoints))
+    # Sort by shortage (most critical first), ties keep Odoo's order
+    order = keep[np.argsort(-shortage[keep], kind='stable')]
 
     results = []
-    for op in orderpoints:
-        if not op.get('product_id'):
-            continue
-
-        prod_id = op['product_id'][0]
-        prod = products_data.get(prod_id, {})
-        on_hand = prod.get('qty_available', 0)
-        min_qty = op.get('product_min_qty', 0)
-
-        # Skip if not below minimum and filter is enabled
-        if only_below_minimum and on_hand >= min_qty:
-            continue
-
-        results.append({
-            'product_id': prod_id,
+    for i, short, is_below in zip(order.tolist(), shortage[order].tolist(), below[order].tolist()):
+        op = orderpoints[i]
+        prod = prods[i]
+        row = {
+            'product_id': op['product_id'][0],
             'product_name': op['product_id'][1],
             'product_code': prod.get('default_code') or 'N/A',
-            'on_hand': on_hand,
-            'forecasted': prod.get('virtual_available', 0),
-            'min_qty': min_qty,
+            'on_hand': prod.get('qty_available', 0),
+        }
+        if include_forecasted:
+            row['forecasted'] = prod.get('virtual_available', 0)
+        row.update({
+            'min_qty': op.get('product_min_qty', 0),
             'max_qty': op.get('product_max_qty', 0),
             'qty_to_order': op.get('qty_to_order', 0),
             'trigger': op.get('trigger', 'auto'),
             'location': op['location_id'][1] if op.get('location_id') else None,
-            'below_minimum': on_hand < min_qty,
-            'shortage': max(0, min_qty - on_hand)
+            'below_minimum': is_below,
+            'shortage': short
         })
-
-    # Sort by shortage (most critical first)
-    results.sort(key=lambda x: x['shortage'], reverse=True)
+        results.append(row)
 
     summary = {
         'total_rules': len(results),
-        'below_minimum_count': sum(1 for r in results if r['below_minimum']),
-        'total_shortage': sum(r['shortage'] for r in results)
+        'below_minimum_count': int(below[keep].sum()),
+        'total_shortage': float(shortage[keep].sum())
     }
 
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps({'summary': summary, 'reorder_rules': results}, indent=2)
+            text=dumps({'summary': summary, 'reorder_rules': results})
         )]
     )
 
 
 def handle_get_stock_levels(client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
     """Get current stock levels for products."""
-    analyzer = StockLevelAnalyzer(client)
+    analyzer = analyzers.StockLevelAnalyzer(client)
     results = analyzer.get_stock_levels(
         product_ids=arguments.get("product_ids"),
         category_ids=arguments.get("category_ids"),
@@ -143,14 +147,14 @@ def handle_get_stock_levels(client: OdooClient, arguments: dict[str, Any]) -> Ca
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps(serialize_results(results), indent=2)
+            text=dumps(results)
         )]
     )
 
 
 def handle_get_reorder_alerts(client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
     """Get products that need reordering."""
-    analyzer = StockLevelAnalyzer(client)
+    analyzer = analyzers.StockLevelAnalyzer(client)
     results = analyzer.get_reorder_alerts(
         threshold_days=arguments.get("threshold_days", 7),
         warehouse_id=arguments.get("warehouse_id")
@@ -158,20 +162,20 @@ def handle_get_reorder_alerts(client: OdooClient, arguments: dict[str, Any]) ->
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps(serialize_results(results), indent=2)
+            text=dumps(results)
         )]
     )
 
 
 def handle_get_stock_summary(client: OdooClient, arguments: dict[str, Any]) -> CallToolResult:
     """Get summary statistics of stock levels."""
-    analyzer = StockLevelAnalyzer(client)
+    analyzer = analyzers.StockLevelAnalyzer(client)
     summary = analyzer.get_stock_summary(
         warehouse_id=arguments.get("warehouse_id")
     )
     return CallToolResult(
         content=[TextContent(
             type="text",
-            text=json.dumps(summary, indent=2)
+            text=dumps(summary)
         )]
     )
@@ -0,0 +1,52 @@
+"""
+Process pool for CPU-bound analysis work.
+
+Model fitting in the analyzers is pure NumPy/pandas work that holds the GIL,
+so large product lists are fanned out to worker processes instead of threads.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_SIZE = 0
+
+
+def _warmup() -> None:
+    """Import the forecasting module so each worker starts with it loaded."""
+    from .analysis import forecasting  # noqa: F401
+
+
+def start_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Create the shared process pool (MCP_PROCESS_WORKERS=0 disables it)."""
+    global _POOL, _POOL_SIZE
+    if _POOL is None:
+        workers = int(os.environ.get("MCP_PROCESS_WORKERS", os.cpu_count() or 1))
+        if workers > 1:
+            _POOL = ProcessPoolExecutor(max_workers=workers, initializer=_warmup)
+            _POOL_SIZE = workers
+            # Launch the workers now, before the event loop starts any threads;
+            # the initializer already imports forecasting, so submit a no-op
+            _POOL.submit(int).result()
+    return _POOL
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared process pool, or None if it is not running."""
+    return _POOL
+
+
+def get_process_pool_size() -> int:
+    """Return the number of worker processes in the shared pool (0 if none)."""
+    return _POOL_SIZE
+
+
+def shutdown_process_pool() -> None:
+    """Stop the shared process pool."""
+    global _POOL, _POOL_SIZE
+    if _POOL is not None:
+        _POOL.shutdown(cancel_futures=True)
+        _POOL = None
+        _POOL_SIZE = 0